@@ -45,6 +45,15 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip indexes declared with ddl_if(dialect=...) for other dialects"""
+    if type_ == "index" and not reflected:
+        ddl_if = getattr(object, "_ddl_if", None)
+        if ddl_if is not None and ddl_if.dialect and ddl_if.dialect != context.get_context().dialect.name:
+            return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -63,7 +72,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        render_as_batch=True  # Enable batch mode for SQLite
+        render_as_batch=True,  # Enable batch mode for SQLite
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -74,7 +84,8 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(
         connection=connection, 
         target_metadata=target_metadata,
-        render_as_batch=True  # Enable batch mode for SQLite
+        render_as_batch=True,  # Enable batch mode for SQLite
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""server default for scheduled task execution started_at
+
+Revision ID: 8e62de5aefca
+Revises: c7140d916403
+Create Date: 2026-10-17 07:22:18.747641
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e62de5aefca'
+down_revision: Union[str, Sequence[str], None] = 'c7140d916403'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('scheduled_task_executions', schema=None) as batch_op:
+        batch_op.alter_column('started_at',
+               existing_type=sa.DateTime(timezone=True),
+               server_default=sa.text('CURRENT_TIMESTAMP'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('scheduled_task_executions', schema=None) as batch_op:
+        batch_op.alter_column('started_at',
+               existing_type=sa.DateTime(timezone=True),
+               server_default=None,
+               existing_nullable=False)
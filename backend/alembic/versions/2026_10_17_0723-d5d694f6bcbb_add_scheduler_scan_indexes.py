@@ -0,0 +1,37 @@
+"""add scheduler scan indexes
+
+Revision ID: d5d694f6bcbb
+Revises: 8e62de5aefca
+Create Date: 2026-10-17 07:23:32.022805
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5d694f6bcbb'
+down_revision: Union[str, Sequence[str], None] = '8e62de5aefca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without locking writes on PostgreSQL; CONCURRENTLY
+    # cannot run inside a transaction (other dialects ignore the flag)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_scheduled_task_executions_task_started', 'scheduled_task_executions', ['task_id', 'started_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_scheduled_tasks_active', 'scheduled_tasks', ['is_active', 'owner_id'], unique=False, postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+
+    # The composite index leads with task_id, so the single-column one is redundant
+    op.drop_index(op.f('ix_scheduled_task_executions_task_id'), table_name='scheduled_task_executions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_scheduled_task_executions_task_id'), 'scheduled_task_executions', ['task_id'], unique=False)
+    op.drop_index('ix_scheduled_tasks_active', table_name='scheduled_tasks', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_scheduled_task_executions_task_started', table_name='scheduled_task_executions')
@@ -0,0 +1,40 @@
+"""add users trigram search indexes
+
+Revision ID: 7e3526a74dd7
+Revises: d5d694f6bcbb
+Create Date: 2026-10-17 07:42:41.145169
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3526a74dd7'
+down_revision: Union[str, Sequence[str], None] = 'd5d694f6bcbb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm GIN indexes only exist on PostgreSQL; other dialects keep
+    # scanning for the admin user search
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_trgm', 'users', [sa.text('lower(email) gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_users_name_trgm', 'users', [sa.text('lower(name) gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index('ix_users_name_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
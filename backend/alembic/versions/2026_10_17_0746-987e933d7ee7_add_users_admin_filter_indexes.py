@@ -0,0 +1,35 @@
+"""add users admin filter indexes
+
+Revision ID: 987e933d7ee7
+Revises: 7e3526a74dd7
+Create Date: 2026-10-17 07:46:15.033717
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '987e933d7ee7'
+down_revision: Union[str, Sequence[str], None] = '7e3526a74dd7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without locking writes on PostgreSQL; CONCURRENTLY
+    # cannot run inside a transaction (other dialects ignore the flag)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_admin_filters', 'users', ['is_active', 'is_verified', 'is_superuser', 'created_at'], unique=False, postgresql_concurrently=True)
+        if op.get_bind().dialect.name == 'postgresql':
+            op.create_index('ix_users_active_created_at', 'users', ['created_at'], unique=False, postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_active_created_at', table_name='users', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_users_admin_filters', table_name='users')
@@ -10,6 +10,7 @@ from sqlalchemy.orm import selectinload
 
 from src.database import get_async_session
 from src.ai_models.models import ModelProvider, Model
+from src.rag.embeddings import invalidate_embedders
 from .schemas import (
     ModelProviderCreate,
     ModelProviderUpdate,
@@ -116,6 +117,7 @@ async def update_provider(
         setattr(provider, field, value)
     
     await session.commit()
+    invalidate_embedders()
     await session.refresh(provider)
     return provider
 
@@ -136,6 +138,7 @@ async def delete_provider(
     
     await session.delete(provider)
     await session.commit()
+    invalidate_embedders()
     return {"message": "Provider deleted successfully"}
 
 
@@ -318,6 +321,7 @@ async def update_model(
         setattr(model, field, value)
     
     await session.commit()
+    invalidate_embedders()
     await session.refresh(model)
     return model
 
@@ -338,6 +342,7 @@ async def delete_model(
     
     await session.delete(model)
     await session.commit()
+    invalidate_embedders()
 
 
 @router.post("/providers/ollama/scan", response_model=List[ModelResponse], summary="Scan and import Ollama models")
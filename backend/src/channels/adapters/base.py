@@ -4,6 +4,7 @@ from fastapi import Request, Response
 from pydantic import BaseModel
 
 from src.channels.models import ChannelConfig
+from src.channels.services.base import get_channel_http_client
 
 class IncomingMessage(BaseModel):
     """Normalized message from external channel"""
@@ -23,6 +24,7 @@ class BaseChannelAdapter(ABC):
         self.channel = channel
         self.credentials = channel.credentials
         self.settings = channel.settings
+        self.http = get_channel_http_client()
         self.direct_response: Optional[Response] = None # Store synchronous response if needed
 
     @abstractmethod
@@ -59,7 +59,9 @@ class TelegramChannelAdapter(BaseChannelAdapter):
             return None
             
         username = sender.get("username") # Optional
-        message_id = str(message.get("message_id"))
+        # Left empty when absent so the redelivery dedup skips the message
+        message_id = message.get("message_id")
+        message_id = str(message_id) if message_id is not None else ""
 
         return IncomingMessage(
             user_id=str(user_id),
@@ -84,18 +86,16 @@ class TelegramChannelAdapter(BaseChannelAdapter):
             "parse_mode": "Markdown" # Or HTML
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(url, json=payload, timeout=10.0)
-                resp.raise_for_status()
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to send message to Telegram: {e}")
-                # Don't raise, just log.
+        try:
+            resp = await self.http.post(url, json=payload, timeout=10.0)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to send message to Telegram: {e}")
+            # Don't raise, just log.
 
     async def set_webhook(self, webhook_url: str):
         url = f"{self.api_url}/setWebhook"
-        async with httpx.AsyncClient() as client:
-            # We can also set secret_token here for extra security
-            resp = await client.post(url, json={"url": webhook_url})
-            resp.raise_for_status()
-            return resp.json()
+        # We can also set secret_token here for extra security
+        resp = await self.http.post(url, json={"url": webhook_url})
+        resp.raise_for_status()
+        return resp.json()
@@ -1,6 +1,5 @@
 from typing import Optional, Dict, Any
 from fastapi import Request, Response
-import httpx
 import logging
 import time
 import json
@@ -271,12 +270,11 @@ class WecomChannelAdapter(BaseChannelAdapter):
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, json=payload)
-            data = resp.json()
-            logger.info(f"WeCom Send Response: {data}")
-            if data.get("errcode") != 0:
-                logger.error(f"Failed to send WeCom message: {data}")
+        resp = await self.http.post(url, json=payload)
+        data = resp.json()
+        logger.info(f"WeCom Send Response: {data}")
+        if data.get("errcode") != 0:
+            logger.error(f"Failed to send WeCom message: {data}")
 
     async def _get_access_token(self) -> Optional[str]:
         # Simple caching in memory
@@ -288,17 +286,16 @@ class WecomChannelAdapter(BaseChannelAdapter):
         url = f"{self.API_BASE}/gettoken"
         params = {"corpid": self.corp_id, "corpsecret": self.secret}
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, params=params)
-            data = resp.json()
-            if data.get("errcode") == 0:
-                token = data["access_token"]
-                expires_in = data["expires_in"]
-                self._token_cache = {
-                    "token": token,
-                    "expires_at": now + expires_in - 200 # Buffer
-                }
-                return token
+        resp = await self.http.get(url, params=params)
+        data = resp.json()
+        if data.get("errcode") == 0:
+            token = data["access_token"]
+            expires_in = data["expires_in"]
+            self._token_cache = {
+                "token": token,
+                "expires_at": now + expires_in - 200 # Buffer
+            }
+            return token
         return None
 
     def format_passive_text_response(self, user_id: str, content: str) -> Response:
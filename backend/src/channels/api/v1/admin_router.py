@@ -8,6 +8,7 @@ from src.auth import current_active_user
 from src.users.models import User
 from src.channels.schemas import ChannelRead, ChannelCreate, ChannelUpdate
 from src.channels.service import ChannelService
+from src.scheduler.executor import invalidate_channel
 from src.assistants.models import Assistant
 
 router = APIRouter(prefix="/channels")
@@ -93,7 +94,9 @@ async def update_channel(
     session: AsyncSession = Depends(get_async_session)
 ):
     service, channel = await check_channel_ownership(channel_id, current_user, session)
-    return await service.update_channel(channel_id, channel_data)
+    updated = await service.update_channel(channel_id, channel_data)
+    invalidate_channel(channel_id)
+    return updated
 
 @router.delete("/{channel_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_channel(
@@ -103,3 +106,4 @@ async def delete_channel(
 ):
     service, channel = await check_channel_ownership(channel_id, current_user, session)
     await service.delete_channel(channel_id)
+    invalidate_channel(channel_id)
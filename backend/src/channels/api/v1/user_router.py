@@ -9,6 +9,8 @@ from src.database import get_async_session
 from src.auth import current_active_user
 from src.users.models import User
 from src.channels.models import UserChannelBinding
+from src.channels.service import channel_binding_cache_key
+from src.services.cache import get_cache_service
 
 router = APIRouter(prefix="/channel-bindings", tags=["Channel Bindings"])
 
@@ -50,4 +52,5 @@ async def delete_my_binding(
     
     await session.delete(binding)
     await session.commit()
+    await get_cache_service().delete(channel_binding_cache_key(binding.provider, binding.external_user_id))
 
@@ -25,7 +25,7 @@ async def channel_webhook(
     Public webhook endpoint for receiving events from third-party platforms.
     Now operating in ASYNC mode:
     1. Verify signature
-    2. Enqueue background task
+    2. Enqueue the message for the incoming message workers (after responding)
     3. Return 200 OK immediately
     """
     service = ChannelService(session)
@@ -49,6 +49,7 @@ async def channel_webhook(
                     user_id=payload["user_id"],
                     text=payload["content"],
                     stream_id=payload.get("stream_id"),
+                    message_id=payload.get("message_id"),
                 )
 
             # 3. Check for Direct Response (Stream Poll or Init)
@@ -2,10 +2,11 @@
 import asyncio
 import uuid
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
 from fastapi import Request, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
+from sqlalchemy.dialects import postgresql, sqlite
 
 from src.channels.models import ChannelConfig, ChannelProvider, UserChannelBinding
 from src.channels.schemas import ChannelCreate, ChannelUpdate
@@ -16,9 +17,43 @@ from src.channels.adapters.wecom_smart_bot import WecomSmartBotChannelAdapter
 from src.assistants.models import Conversation, Assistant, ConversationStatusEnum
 from src.chat.service import LangchainChatService 
 from src.chat.models import MessageRole
+from src.services.cache import get_cache_service
 
 logger = logging.getLogger(__name__)
 
+# External user -> internal user id mappings are cached for this long; the
+# binding table stays the source of truth. Admin user deletes drop the keys,
+# the short TTL bounds staleness for any other delete path
+CHANNEL_BINDING_CACHE_TTL = 600
+
+
+def channel_binding_cache_key(provider: str, external_user_id: str) -> str:
+    return f"channel_binding:{provider}:{external_user_id}"
+
+
+def _event_content(chunk: Dict[str, Any]) -> str:
+    if chunk.get("type") == "content_chunk":
+        return (chunk.get("data") or {}).get("content") or ""
+    return ""
+
+
+def _attribute_content(chunk: Any) -> str:
+    return chunk.content or ""
+
+
+def _no_content(chunk: Any) -> str:
+    return ""
+
+
+def _content_extractor(chunk: Any) -> Callable[[Any], str]:
+    """Pick the text extractor for a stream from the shape of its first chunk"""
+    if isinstance(chunk, dict):
+        return _event_content
+    if hasattr(chunk, "content"):
+        return _attribute_content
+    return _no_content
+
+
 class ChannelService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -154,7 +189,8 @@ class ChannelService:
              result["async_task_payload"] = {
                 "user_id": incoming.user_id,
                 "content": incoming.content,
-                "stream_id": incoming.stream_id
+                "stream_id": incoming.stream_id,
+                "message_id": incoming.message_id
                 # "username": incoming.username
             }
             
@@ -178,12 +214,15 @@ class ChannelService:
             conversation, user_id = await self._ensure_conversation_context(channel, incoming)
 
             # 2. Stream Generation
+            extract = None
             async for chunk in self.chat_service.send_message_stream(
                 conversation_id=conversation.id,
                 user_id=user_id,
                 content=incoming.content,
             ):
-                content_part = self._extract_content_from_chunk(chunk)
+                if extract is None:
+                    extract = _content_extractor(chunk)
+                content_part = extract(chunk)
                 if content_part:
                     await stream_buffer.append_content(stream_id, content_part)
             
@@ -215,12 +254,15 @@ class ChannelService:
             conversation, user_id = await self._ensure_conversation_context(channel, incoming)
 
             full_response_text = ""
+            extract = None
             async for chunk in self.chat_service.send_message_stream(
                 conversation_id=conversation.id,
                 user_id=user_id,
                 content=incoming.content,
             ):
-                text = self._extract_content_from_chunk(chunk)
+                if extract is None:
+                    extract = _content_extractor(chunk)
+                text = extract(chunk)
                 if text:
                     full_response_text += text
                     
@@ -237,7 +279,7 @@ class ChannelService:
     async def _ensure_conversation_context(self, channel: ChannelConfig, incoming: IncomingMessage):
         """Find or create a conversation for the incoming message"""
         # Resolve the effective user (create a new internal user if this is a new external user)
-        user = await self._get_or_create_channel_user(channel, incoming)
+        user_id = await self._resolve_channel_user_id(channel, incoming)
         
         # Now find the LAST conversation for this user and assistant
         # Note: In the future we might want session handling. For now, we resume the last one or create new.
@@ -248,63 +290,81 @@ class ChannelService:
         # Wait, if we use real user_id now, we don't need to search by JSON metadata anymore!
         # We can search by `user_id` and `assistant_id` in Conversations table.
         
-        conversation = await self._find_active_conversation(user.id, channel.assistant_id)
+        conversation = await self._find_active_conversation(user_id, channel.assistant_id)
         
         if not conversation:
             provider_name = channel.provider.value if hasattr(channel.provider, "value") else channel.provider
             title = f"{incoming.username or 'User'} via {provider_name}"
             
+            # We still keep metadata for debugging or reverse lookups
             conversation = await self.chat_service.conversation_service.create_conversation(
-                user_id=user.id,
+                user_id=user_id,
                 assistant_id=channel.assistant_id,
-                title=title
+                title=title,
+                extra_data={
+                    "channel_id": str(channel.id),
+                    "external_user_id": incoming.user_id,
+                    "provider": channel.provider,
+                    "username": incoming.username
+                }
             )
-            # We still keep metadata for debugging or reverse lookups
-            conversation.extra_data = {
-                "channel_id": str(channel.id),
-                "external_user_id": incoming.user_id,
-                "provider": channel.provider,
-                "username": incoming.username
-            }
-            self.session.add(conversation)
-            await self.session.commit()
             
-        return conversation, user.id
+        return conversation, user_id
+
+    async def _resolve_channel_user_id(self, channel: ChannelConfig, incoming: IncomingMessage) -> uuid.UUID:
+        """
+        Internal user id for the sender, served from the cache for returning
+        users and falling back to the binding lookup/creation on a miss.
+        """
+        provider = channel.provider.value if hasattr(channel.provider, "value") else channel.provider
+        cache = get_cache_service()
+        key = channel_binding_cache_key(provider, incoming.user_id)
+        try:
+            cached = await cache.get(key)
+            if cached:
+                return uuid.UUID(str(cached))
+        except Exception:
+            # If cache fails, fallback to DB
+            pass
+
+        user = await self._get_or_create_channel_user(channel, incoming)
+        try:
+            await cache.set(key, str(user.id), expire=CHANNEL_BINDING_CACHE_TTL)
+        except Exception:
+            pass
+        return user.id
 
     async def _get_or_create_channel_user(self, channel: ChannelConfig, incoming: IncomingMessage):
         """
         Map external identity (e.g. WeCom UserId) to internal User.
         If mapped user doesn't exist, create a new 'visitor' User.
         """
-        from src.channels.models import ChannelIdentity
         from src.users.models import User
         
         provider = channel.provider.value if hasattr(channel.provider, "value") else channel.provider
         external_id = incoming.user_id
         
-        # 1. Lookup Identity
-        stmt = select(ChannelIdentity).where(
-            ChannelIdentity.provider == provider,
-            ChannelIdentity.identity_id == external_id
+        # 1. Lookup the binding together with its user in one query
+        stmt = select(UserChannelBinding, User).outerjoin(
+            User, User.id == UserChannelBinding.user_id
+        ).where(
+            UserChannelBinding.provider == provider,
+            UserChannelBinding.external_user_id == external_id
         )
         result = await self.session.execute(stmt)
-        identity = result.scalar_one_or_none()
+        row = result.first()
         
-        if identity:
-            identity.last_seen_at = func.now()
-            # Update extra data if needed (e.g. name change)
-            # identity.extra_data = ...
-            await self.session.commit()
-            
-            # Fetch User
-            user = await self.session.get(User, identity.user_id)
+        if row:
+            binding, user = row
             if user:
+                binding.last_seen_at = func.now()
+                await self.session.commit()
                 return user
             else:
-                 logger.warning(f"ChannelIdentity {identity.id} points to missing user {identity.user_id}")
-                 # Fallthrough to recreate? Or raise error? Let's recreate.
-                 await self.session.delete(identity)
-                 await self.session.commit()
+                 logger.warning(f"UserChannelBinding {binding.id} points to missing user {binding.user_id}")
+                 # Fallthrough to recreate
+                 await self.session.delete(binding)
+                 await self.session.flush()
 
         # 2. Create New User & Identity
         # Use a random placeholder email or None if model allows. 
@@ -321,18 +381,52 @@ class ChannelService:
         self.session.add(new_user)
         await self.session.flush() # Get ID
         
-        new_identity = ChannelIdentity(
+        insert_stmt = self._binding_insert()
+        if insert_stmt is None:
+            self.session.add(UserChannelBinding(
+                user_id=new_user.id,
+                channel_config_id=channel.id,
+                provider=provider,
+                external_user_id=external_id,
+                metadata_={"username": incoming.username}
+            ))
+            await self.session.commit()
+            return new_user
+
+        # Upsert the binding so a concurrent message from the same external
+        # user that created it first wins; RETURNING yields the winning user
+        stmt = insert_stmt.values(
+            id=uuid.uuid4(),
             user_id=new_user.id,
-            channel_id=channel.id,
+            channel_config_id=channel.id,
             provider=provider,
-            identity_id=external_id,
-            extra_data={"username": incoming.username}
+            external_user_id=external_id,
+            metadata_={"username": incoming.username},
+            last_seen_at=func.now()
         )
-        self.session.add(new_identity)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["provider", "external_user_id"],
+            set_={"last_seen_at": stmt.excluded.last_seen_at}
+        ).returning(UserChannelBinding.user_id)
+        bound_user_id = (await self.session.execute(stmt)).scalar_one()
+
+        if bound_user_id != new_user.id:
+            await self.session.delete(new_user)
+            await self.session.commit()
+            return await self.session.get(User, bound_user_id)
+
         await self.session.commit()
-        
         return new_user
 
+    def _binding_insert(self):
+        """Dialect-specific INSERT supporting ON CONFLICT, or None if unsupported"""
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(UserChannelBinding)
+        if dialect == "sqlite":
+            return sqlite.insert(UserChannelBinding)
+        return None
+
     async def _find_active_conversation(self, user_id: uuid.UUID, assistant_id: uuid.UUID) -> Optional[Conversation]:
         """Find the most recent conversation for this user/assistant pair"""
         stmt = select(Conversation).where(
@@ -343,15 +437,6 @@ class ChannelService:
         result = await self.session.execute(stmt)
         return result.scalars().first()
 
-    def _extract_content_from_chunk(self, chunk: Any) -> str:
-        """Extract text content from various chunk formats"""
-        if isinstance(chunk, dict):
-            if chunk.get("type") == "content_chunk":
-                return chunk.get("data", {}).get("content", "")
-        elif hasattr(chunk, "content"):
-            return chunk.content or ""
-        return ""
-
     async def _find_conversation_by_channel(self, channel_id: uuid.UUID, ext_user_id: str) -> Optional[Conversation]:
         # Implementation for PostgreSQL using JSON path operators
         # cast to string to be safe
@@ -405,30 +490,25 @@ class ChannelService:
                 conversation = await self.chat_service.conversation_service.create_conversation(
                     user_id=user_id,
                     assistant_id=assistant.id,
-                    title=title
+                    title=title,
+                    extra_data={
+                        "channel_id": str(channel.id),
+                        "external_user_id": incoming.user_id,
+                        "provider": channel.provider,
+                        "username": incoming.username
+                    }
                 )
-                conversation.extra_data = {
-                    "channel_id": str(channel.id),
-                    "external_user_id": incoming.user_id,
-                    "provider": channel.provider,
-                    "username": incoming.username
-                }
-                self.session.add(conversation)
-                await self.session.commit()
 
             # 2. Stream Generation
+            extract = None
             async for chunk in self.chat_service.send_message_stream(
                 conversation_id=conversation.id,
                 user_id=user_id,
                 content=incoming.content,
             ):
-                content_part = ""
-                if isinstance(chunk, dict):
-                    if chunk.get("type") == "content_chunk":
-                        content_part = chunk.get("data", {}).get("content", "")
-                elif hasattr(chunk, "content"):
-                    content_part = chunk.content
-                
+                if extract is None:
+                    extract = _content_extractor(chunk)
+                content_part = extract(chunk)
                 if content_part:
                     await stream_buffer.append_content(stream_id, content_part)
             
@@ -0,0 +1,16 @@
+"""
+Channel services module initialization
+"""
+from .base import BaseChannelService, get_channel_service_class, register_channel_service
+
+# Import provider services - triggers @register_channel_service
+from . import telegram  # noqa: F401
+from . import wecom  # noqa: F401
+from . import wecom_smart_bot  # noqa: F401
+from . import wecom_webhook  # noqa: F401
+
+__all__ = [
+    "BaseChannelService",
+    "get_channel_service_class",
+    "register_channel_service",
+]
@@ -1,12 +1,111 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List, Optional
-from src.channels.models import ChannelConfig
+from typing import AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional, Type
+
+import httpx
+
+from src.channels.models import ChannelConfig, ChannelProvider
+
+# Connection pool shared by all channel services and adapters, so outbound
+# calls to the same provider API reuse kept-alive connections
+CHANNEL_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Channel service classes by provider, filled in by @register_channel_service
+# when the service modules are imported (see the package __init__)
+_service_registry: Dict[str, Type["BaseChannelService"]] = {}
+
+
+def get_channel_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(limits=CHANNEL_HTTP_LIMITS)
+    return _http_client
+
+
+async def close_channel_http_client() -> None:
+    """Close the shared channel HTTP client"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def register_channel_service(
+    provider: ChannelProvider
+) -> Callable[[Type["BaseChannelService"]], Type["BaseChannelService"]]:
+    """Register a channel service class as the implementation for a provider"""
+    def decorator(service_class: Type["BaseChannelService"]) -> Type["BaseChannelService"]:
+        _service_registry[provider] = service_class
+        return service_class
+    return decorator
+
+
+def get_channel_service_class(provider: str) -> Optional[Type["BaseChannelService"]]:
+    return _service_registry.get(provider)
+
+
+async def coalesce_stream(
+    stream: AsyncIterator[str],
+    max_delay: float = 0.15,
+    max_chars: int = 256
+) -> AsyncGenerator[str, None]:
+    """
+    Merge small stream chunks so channel services handle fewer, larger pieces.
+    Buffered text is flushed max_delay seconds after its first chunk arrived,
+    or as soon as it reaches max_chars.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = stream.__aiter__()
+    buffer: List[str] = []
+    size = 0
+    deadline = 0.0
+    # The pending __anext__ is kept across flushes instead of being cancelled
+    # on timeout, which would close the source generator
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = max(deadline - loop.time(), 0) if buffer else None
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            if not done:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                continue
+
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+
+            if not chunk:
+                continue
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= max_chars or loop.time() >= deadline:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 class BaseChannelService(ABC):
-    def __init__(self, channel: ChannelConfig):
+    def __init__(self, channel: ChannelConfig, http: Optional[httpx.AsyncClient] = None):
         self.channel = channel
         self.credentials = channel.credentials
         self.settings = channel.settings
+        self.http = http or get_channel_http_client()
 
     @abstractmethod
     async def send_text(self, target_id: str, text: str) -> None:
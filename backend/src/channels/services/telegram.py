@@ -1,18 +1,19 @@
 import logging
 import httpx
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 import asyncio
 
-from src.channels.services.base import BaseChannelService
-from src.channels.models import ChannelConfig
+from src.channels.services.base import BaseChannelService, register_channel_service
+from src.channels.models import ChannelConfig, ChannelProvider
 
 logger = logging.getLogger(__name__)
 
+@register_channel_service(ChannelProvider.TELEGRAM)
 class TelegramChannelService(BaseChannelService):
     BASE_URL = "https://api.telegram.org/bot"
 
-    def __init__(self, channel: ChannelConfig):
-        super().__init__(channel)
+    def __init__(self, channel: ChannelConfig, http: Optional[httpx.AsyncClient] = None):
+        super().__init__(channel, http)
         self.token = self.credentials.get("bot_token")
         if not self.token:
             raise ValueError("Telegram Bot Token is missing in credentials")
@@ -23,22 +24,20 @@ class TelegramChannelService(BaseChannelService):
         Send a simple text message.
         target_id: Telegram Chat ID
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(
-                    f"{self.api_url}/sendMessage",
-                    json={"chat_id": target_id, "text": text}
-                )
-                resp.raise_for_status()
-            except Exception as e:
-                logger.error(f"Failed to send message to Telegram {target_id}: {e}")
-                raise
+        try:
+            resp = await self.http.post(
+                f"{self.api_url}/sendMessage",
+                json={"chat_id": target_id, "text": text}
+            )
+            resp.raise_for_status()
+        except Exception as e:
+            logger.error(f"Failed to send message to Telegram {target_id}: {e}")
+            raise
 
     async def send_stream(self, target_id: str, stream_generator: AsyncGenerator[str, None]) -> None:
         """
         Simulate stream by editing the message.
         """
-        client = httpx.AsyncClient()
         msg_id: str | None = None
         full_text = ""
         last_update_text = ""
@@ -48,7 +47,7 @@ class TelegramChannelService(BaseChannelService):
 
         try:
             # 1. 发送初始消息
-            init_resp = await client.post(
+            init_resp = await self.http.post(
                 f"{self.api_url}/sendMessage",
                 json={"chat_id": target_id, "text": "Thinking..."}
             )
@@ -70,7 +69,7 @@ class TelegramChannelService(BaseChannelService):
                 # Check if we should update (time elapsed and content changed enough)
                 if (now - last_time) >= update_interval and full_text != last_update_text:
                     try:
-                        await client.post(
+                        await self.http.post(
                             f"{self.api_url}/editMessageText",
                             json={
                                 "chat_id": target_id,
@@ -86,7 +85,7 @@ class TelegramChannelService(BaseChannelService):
 
             # Final update ensures complete text
             if full_text != last_update_text:
-                 await client.post(
+                 await self.http.post(
                     f"{self.api_url}/editMessageText",
                     json={
                         "chat_id": target_id,
@@ -100,5 +99,3 @@ class TelegramChannelService(BaseChannelService):
             # If things crash, try to send what we have as a new message?
             if full_text and full_text != last_update_text:
                  await self.send_text(target_id, full_text)
-        finally:
-            await client.aclose()
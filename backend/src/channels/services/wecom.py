@@ -1,19 +1,20 @@
 import logging
 import httpx
 import time
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 import json
 
-from src.channels.services.base import BaseChannelService
-from src.channels.models import ChannelConfig
+from src.channels.services.base import BaseChannelService, register_channel_service
+from src.channels.models import ChannelConfig, ChannelProvider
 
 logger = logging.getLogger(__name__)
 
+@register_channel_service(ChannelProvider.WECOM)
 class WecomChannelService(BaseChannelService):
     API_BASE = "https://qyapi.weixin.qq.com/cgi-bin"
 
-    def __init__(self, channel: ChannelConfig):
-        super().__init__(channel)
+    def __init__(self, channel: ChannelConfig, http: Optional[httpx.AsyncClient] = None):
+        super().__init__(channel, http)
         self.corp_id = self.credentials.get("corp_id")
         self.secret = self.credentials.get("secret")
         self.agent_id = self.credentials.get("agent_id")
@@ -29,19 +30,18 @@ class WecomChannelService(BaseChannelService):
         if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.API_BASE}/gettoken",
-                params={"corpid": self.corp_id, "corpsecret": self.secret}
-            )
-            data = resp.json()
-            if data.get("errcode") != 0:
-                raise Exception(f"Failed to get WeCom access token: {data}")
+        resp = await self.http.get(
+            f"{self.API_BASE}/gettoken",
+            params={"corpid": self.corp_id, "corpsecret": self.secret}
+        )
+        data = resp.json()
+        if data.get("errcode") != 0:
+            raise Exception(f"Failed to get WeCom access token: {data}")
             
-            self._access_token = data["access_token"]
-            # Set expiry a bit earlier than actual (7200s) to be safe
-            self._token_expires_at = time.time() + data.get("expires_in", 7200) - 200
-            return self._access_token
+        self._access_token = data["access_token"]
+        # Set expiry a bit earlier than actual (7200s) to be safe
+        self._token_expires_at = time.time() + data.get("expires_in", 7200) - 200
+        return self._access_token
 
     async def send_text(self, target_id: str, text: str) -> None:
         """
@@ -85,16 +85,15 @@ class WecomChannelService(BaseChannelService):
             # Default: User
             payload["touser"] = target_id
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                url,
-                params={"access_token": token},
-                json=payload
-            )
-            data = resp.json()
-            if data.get("errcode") != 0:
-                logger.error(f"WeCom send failed: {data}")
-                raise Exception(f"WeCom API Error: {data}")
+        resp = await self.http.post(
+            url,
+            params={"access_token": token},
+            json=payload
+        )
+        data = resp.json()
+        if data.get("errcode") != 0:
+            logger.error(f"WeCom send failed: {data}")
+            raise Exception(f"WeCom API Error: {data}")
 
     async def send_stream(self, target_id: str, stream_generator: AsyncGenerator[str, None]) -> None:
         """
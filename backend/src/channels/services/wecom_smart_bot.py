@@ -1,9 +1,10 @@
 import logging
 import time
+import httpx
 from typing import AsyncGenerator, Dict, Any, Optional
 
-from src.channels.services.base import BaseChannelService
-from src.channels.models import ChannelConfig
+from src.channels.services.base import BaseChannelService, register_channel_service
+from src.channels.models import ChannelConfig, ChannelProvider
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ def cleanup_streams(ttl: int = 3600):
         del _STREAM_STORE[k]
 
 
+@register_channel_service(ChannelProvider.WECOM_SMART_BOT)
 class WecomSmartBotChannelService(BaseChannelService):
     """
     Service for WeCom Smart Bot (Active Push Side).
@@ -46,8 +48,8 @@ class WecomSmartBotChannelService(BaseChannelService):
     The Client (WeCom) will poll via the Adapter (Passive Reply).
     """
 
-    def __init__(self, channel: ChannelConfig):
-        super().__init__(channel)
+    def __init__(self, channel: ChannelConfig, http: Optional[httpx.AsyncClient] = None):
+        super().__init__(channel, http)
 
     async def send_text(self, target_id: str, text: str) -> None:
         """
@@ -1,19 +1,20 @@
 import logging
 import httpx
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
-from src.channels.services.base import BaseChannelService
-from src.channels.models import ChannelConfig
+from src.channels.services.base import BaseChannelService, register_channel_service
+from src.channels.models import ChannelConfig, ChannelProvider
 
 logger = logging.getLogger(__name__)
 
+@register_channel_service(ChannelProvider.WECOM_WEBHOOK)
 class WecomWebhookChannelService(BaseChannelService):
     """
     Service for WeCom Group Robot (Webhook).
     """
 
-    def __init__(self, channel: ChannelConfig):
-        super().__init__(channel)
+    def __init__(self, channel: ChannelConfig, http: Optional[httpx.AsyncClient] = None):
+        super().__init__(channel, http)
         self.webhook_url = self.credentials.get("webhook_url")
         
         # Helper: If user only pasted the key
@@ -48,13 +49,12 @@ class WecomWebhookChannelService(BaseChannelService):
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, json=payload)
-            try:
-                data = resp.json()
-                if data.get("errcode") != 0:
-                    logger.error(f"WeCom Webhook send failed: {data}")
-                    raise Exception(f"WeCom API Error: {data}")
-            except Exception as e:
-                logger.error(f"Failed to parse response: {resp.text}")
-                raise e
+        resp = await self.http.post(url, json=payload)
+        try:
+            data = resp.json()
+            if data.get("errcode") != 0:
+                logger.error(f"WeCom Webhook send failed: {data}")
+                raise Exception(f"WeCom API Error: {data}")
+        except Exception as e:
+            logger.error(f"Failed to parse response: {resp.text}")
+            raise e
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +24,7 @@ class ConversationService:
         assistant_id: uuid.UUID,
         user_id: uuid.UUID,
         title: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None,
     ) -> Conversation:
         assistant_result = await self.session.execute(
             select(Assistant).where(Assistant.id == assistant_id)
@@ -42,6 +43,7 @@ class ConversationService:
             assistant_id=assistant_id,
             user_id=user_id,
             status="ACTIVE",
+            extra_data=extra_data or {},
         )
 
         self.session.add(conversation)
@@ -48,6 +48,12 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///storage/database/riceball.db"
+    # Connection pool (ignored for SQLite)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    # Open DATABASE_POOL_SIZE connections at startup so the first requests
+    # don't pay for the handshake
+    DATABASE_POOL_WARMUP: bool = False
 
     # Sandbox
     SANDBOX_IMAGE_NAME: str = "ghcr.io/riceball-ai/riceball-sandbox:latest"
@@ -55,10 +61,21 @@ class Settings(BaseSettings):
     SANDBOX_CPU_LIMIT: float = 0.5
     SANDBOX_ENABLE_NETWORK: bool = False
     SANDBOX_WORK_DIR: str = "/home/sandbox"
+    SANDBOX_API_TIMEOUT: float = 30.0  # Seconds allowed for a Docker API call (not code execution)
+    # Optional: directory on the Docker host whose per-conversation subdirectories
+    # are bind-mounted as the sandbox work dir, so uploaded files are written
+    # through the filesystem instead of the Docker archive API
+    SANDBOX_HOST_IO_DIR: str | None = None
+    SANDBOX_LOCAL_IO_DIR: Path | None = None  # Same directory as seen by the backend; defaults to SANDBOX_HOST_IO_DIR
+    # Idle containers kept running so new conversations skip create+start; off
+    # by default (not used with SANDBOX_HOST_IO_DIR, since the mount is per
+    # conversation)
+    SANDBOX_POOL_SIZE: int = 0
 
     # Cache
     CACHE_DRIVER: str = "memory"  # 'memory' or 'redis'
     CACHE_PREFIX: str = "riceball:"  # Prefix for cache keys to avoid conflicts
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000  # Max keys held by the memory driver (approximate LRU eviction)
     REDIS_URL: str = "redis://localhost:6379/0"
 
     # Auth
@@ -1,4 +1,5 @@
 from collections.abc import AsyncGenerator
+import asyncio
 import os
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
@@ -7,6 +8,7 @@ from .config import settings
 
 # Handle SQLite specific configuration
 connect_args = {}
+engine_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
     
@@ -18,11 +20,26 @@ if settings.DATABASE_URL.startswith("sqlite"):
             os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
         except Exception as e:
             print(f"Warning: Could not create database directory: {e}")
+else:
+    engine_args["pool_size"] = settings.DATABASE_POOL_SIZE
+    engine_args["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
 
-engine = create_async_engine(settings.DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+engine = create_async_engine(settings.DATABASE_URL, connect_args=connect_args, pool_pre_ping=True, **engine_args)
 
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def warm_up_pool() -> None:
+    """Open pool_size connections at once and return them to the pool"""
+    size = engine_args.get("pool_size")
+    if not size:
+        return
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    errors = [c for c in connections if isinstance(c, BaseException)]
+    await asyncio.gather(*(c.close() for c in connections if not isinstance(c, BaseException)))
+    if errors:
+        raise errors[0]
@@ -5,7 +5,7 @@ import base64
 import logging
 import urllib.parse
 from pathlib import Path
-from typing import List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile, Depends
@@ -253,6 +253,25 @@ class FileService:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_files_by_paths(self, file_paths: List[str]) -> Dict[str, FileRecord]:
+        """
+        Get file records for multiple file paths with a single query.
+        
+        Args:
+            file_paths: File paths/storage keys
+            
+        Returns:
+            Mapping of file path to FileRecord; paths without a record are omitted
+        """
+        if not file_paths:
+            return {}
+        stmt = select(FileRecord).where(
+            FileRecord.file_path.in_(set(file_paths)),
+            FileRecord.status == FileStatus.ACTIVE
+        )
+        result = await self.db.execute(stmt)
+        return {record.file_path: record for record in result.scalars()}
+
     async def get_file_by_path(self, file_path: str) -> Optional[FileRecord]:
         """
         Get file record by file path.
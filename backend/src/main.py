@@ -7,9 +7,14 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 
 from .config import settings, StorageType
-from .database import async_session_maker, engine
+from .database import async_session_maker, engine, warm_up_pool
 from .agents.mcp.manager import mcp_manager
-from .sandbox.service import close_sandbox_service
+from .sandbox.service import init_sandbox_service, close_sandbox_service
+from .rag.chunker import shutdown_chunk_pool
+from .rag.vector_store import close_vector_store
+from .rag.embeddings import close_embedding_http_clients
+from .channels.services.base import close_channel_http_client
+from .rag.service import RAGService
 from .auth import current_active_user, current_superuser
 from .auth.api.v1.user_router import router as auth_user_router
 from .auth.api.v1.refresh_router import router as auth_refresh_router
@@ -39,6 +44,7 @@ from .channels.api.v1.webhook_router import router as channels_webhook_router
 from .channels.api.v1.user_router import router as channels_binding_router
 from .scheduler.api.v1.user_router import router as scheduler_user_router_v1
 from .scheduler.core import start_scheduler, scheduler
+from .scheduler.executor import start_incoming_message_workers, stop_incoming_message_workers
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 
@@ -76,6 +82,13 @@ async def lifespan(app: FastAPI):
     # Dispose the engine to ensure clean connections in this process
     await engine.dispose()
     
+    # Pre-establish the database pool connections
+    if settings.DATABASE_POOL_WARMUP:
+        try:
+            await warm_up_pool()
+        except Exception as e:
+            logger.warning(f"Failed to warm up database pool: {e}")
+    
     # Initialize MCP Manager
     try:
         async with async_session_maker() as session:
@@ -83,11 +96,26 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize MCP manager: {e}")
 
+    # Connect the shared sandbox docker client
+    try:
+        init_sandbox_service()
+    except Exception as e:
+        logger.warning(f"Sandbox docker client unavailable: {e}")
+
+    # Preload embedding models used by knowledge bases
+    try:
+        async with async_session_maker() as session:
+            await RAGService(session).warmup()
+    except Exception as e:
+        logger.error(f"Failed to warm up embedding models: {e}")
+
     # Start Scheduler
     try:
         await start_scheduler()
     except Exception as e:
         logger.error(f"Failed to start scheduler: {e}")
+
+    start_incoming_message_workers()
         
     yield
     
@@ -97,8 +125,13 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown()
     except Exception as e:
         logger.error(f"Error shutting down scheduler: {e}")
+    await stop_incoming_message_workers()
     await mcp_manager.shutdown()
     await close_sandbox_service()
+    shutdown_chunk_pool()
+    close_vector_store()
+    await close_embedding_http_clients()
+    await close_channel_http_client()
 
 app = FastAPI(**app_config, lifespan=lifespan)
 
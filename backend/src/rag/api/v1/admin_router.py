@@ -11,11 +11,13 @@ from src.auth import current_superuser
 from src.users.models import User
 from ...service import RAGService
 from ...models import KnowledgeBase, Document
+from ...query_cache import query_result_cache
 from .schemas import (
     KnowledgeBaseCreate,
     KnowledgeBaseUpdate,
     KnowledgeBaseResponse,
     DocumentCreateFromFile,
+    DocumentBatchCreateFromFiles,
     DocumentResponse,
     DocumentListResponse,
     DocumentChunkListResponse,
@@ -316,6 +318,42 @@ async def add_document_from_file(
         )
 
 
+@router.post(
+    "/documents/from-files",
+    response_model=list[DocumentResponse],
+    summary="Add documents from files",
+    description="Extract content from multiple uploaded file paths concurrently and add them to knowledge base"
+)
+async def add_documents_from_files(
+    doc_data: DocumentBatchCreateFromFiles,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_superuser)
+):
+    """Add documents to knowledge base from multiple file paths"""
+    try:
+        from src.files.service import FileService
+        
+        file_service = FileService(session)
+        service = RAGService(session, file_service)
+        
+        return await service.add_documents_from_files(
+            file_paths=doc_data.file_paths,
+            knowledge_base_id=doc_data.knowledge_base_id,
+            owner_id=current_user.id,
+            metadata=doc_data.metadata
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add documents from files"
+        )
+
+
 @router.get(
     "/documents/{doc_id}", 
     response_model=DocumentResponse,
@@ -453,6 +491,7 @@ async def delete_knowledge_base_admin(
             doc.status = "DELETED"
         
         await session.commit()
+        query_result_cache.invalidate(kb_id)
         
         return {
             "message": "Knowledge base deleted successfully",
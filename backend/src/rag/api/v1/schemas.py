@@ -81,6 +81,13 @@ class DocumentCreateFromFile(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Extra metadata")
 
 
+class DocumentBatchCreateFromFiles(BaseModel):
+    """Create Documents From Files Request"""
+    file_paths: List[str] = Field(..., min_length=1, max_length=100, description="File storage paths")
+    knowledge_base_id: uuid.UUID = Field(..., description="Knowledge base ID")
+    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Extra metadata applied to every document")
+
+
 class DocumentResponse(BaseModel):
     """Document Response"""
     id: uuid.UUID
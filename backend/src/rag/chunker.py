@@ -1,3 +1,7 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -8,6 +12,53 @@ from langchain_text_splitters import (
 )
 
 
+# Documents larger than this (in characters) are chunked in a worker process
+# so that tokenization doesn't block the event loop
+PROCESS_CHUNKING_THRESHOLD = 100_000
+
+_chunk_pool: Optional[ProcessPoolExecutor] = None
+
+# Per-process chunker instances, reused across tasks executed by a pool worker
+_worker_chunkers: Dict[str, "DocumentChunker"] = {}
+
+
+def _get_chunk_pool() -> ProcessPoolExecutor:
+    global _chunk_pool
+    if _chunk_pool is None:
+        _chunk_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _chunk_pool
+
+
+def shutdown_chunk_pool() -> None:
+    """Shut down the chunking worker pool if it was started"""
+    global _chunk_pool
+    if _chunk_pool is not None:
+        _chunk_pool.shutdown(wait=False, cancel_futures=True)
+        _chunk_pool = None
+
+
+def _chunk_in_worker(
+    encoding_name: str,
+    content: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    metadata: Optional[Dict[str, Any]],
+) -> List["DocumentChunk"]:
+    """Chunk a document inside a pool worker process"""
+    chunker = _worker_chunkers.get(encoding_name)
+    if chunker is None:
+        chunker = _worker_chunkers[encoding_name] = DocumentChunker(encoding_name)
+    return chunker.chunk_document(
+        content,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        metadata=metadata,
+    )
+
+
 @dataclass
 class DocumentChunk:
     """Document chunk data class"""
@@ -78,6 +129,37 @@ class DocumentChunker:
 
         return chunks
 
+    async def achunk_document(
+        self,
+        content: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """Chunk document without blocking the event loop.
+
+        Large documents are offloaded to a process pool, small ones are
+        chunked inline since the round trip to a worker would cost more.
+        """
+        if len(content) < PROCESS_CHUNKING_THRESHOLD:
+            return self.chunk_document(
+                content,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                metadata=metadata,
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_chunk_pool(),
+            _chunk_in_worker,
+            self.encoding_name,
+            content,
+            chunk_size,
+            chunk_overlap,
+            metadata,
+        )
+
     def _count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken"""
         return len(self._encoding.encode(text))
@@ -1,6 +1,7 @@
 """
 Document content extraction service for RAG system.
 """
+import asyncio
 import logging
 import mimetypes
 import os
@@ -97,27 +98,9 @@ class DocumentContentExtractor:
         
         # Use markitdown for unified document processing
         try:
-            from markitdown import MarkItDown
-            
-            # Save file to temporary location
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as temp_file:
-                file_data.seek(0)
-                temp_file.write(file_data.read())
-                temp_file_path = temp_file.name
-            
-            try:
-                md = MarkItDown()
-                result = md.convert(temp_file_path)
-                content = result.text_content
-                
-                if not content.strip():
-                    raise ValueError("No text content extracted from file")
-                
-                return content.strip()
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file_path)
+            # Conversion is blocking, run it in a worker thread so that
+            # concurrent extractions don't stall the event loop
+            return await asyncio.to_thread(self._convert_with_markitdown, file_data, filename)
                 
         except ImportError:
             logger.warning("markitdown not available, falling back to basic extraction")
@@ -128,6 +111,30 @@ class DocumentContentExtractor:
             # If markitdown fails, fallback to basic text extraction
             return await self._extract_text_content(file_data)
     
+    def _convert_with_markitdown(self, file_data: BytesIO, filename: str) -> str:
+        """Convert file content to text with markitdown"""
+        from markitdown import MarkItDown
+        
+        # Save file to temporary location
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as temp_file:
+            file_data.seek(0)
+            temp_file.write(file_data.read())
+            temp_file_path = temp_file.name
+        
+        try:
+            md = MarkItDown()
+            result = md.convert(temp_file_path)
+            content = result.text_content
+            
+            if not content.strip():
+                raise ValueError("No text content extracted from file")
+            
+            return content.strip()
+        finally:
+            # Clean up temporary file
+            os.unlink(temp_file_path)
+    
     def _get_content_type_from_extension(self, ext: str) -> str:
         """Infer content type from file extension"""
         ext_mapping = {
@@ -1,27 +1,272 @@
+import time
 import uuid
+import hashlib
 import logging
 import asyncio
-from typing import List, Optional, Dict
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Any, List, Optional, Dict, Tuple
 
-from sqlalchemy import select
+import httpx
+import numpy as np
+from sqlalchemy import select, insert, delete
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import selectinload
 from src.database import async_session_maker
 from src.ai_models.models import Model, ModelProvider, PROVIDER_INTERFACE_TYPES
+from .models import EmbeddingCache
 
 from langchain_core.embeddings import Embeddings
 
 logger = logging.getLogger(__name__)
 
+# Initialized embedders shared by all EmbeddingService instances, so the
+# construction cost is paid once per process instead of once per request;
+# the least recently used is dropped beyond EMBEDDER_CACHE_SIZE
+EMBEDDER_CACHE_SIZE = 32
+_embedder_cache: "OrderedDict[str, Embeddings]" = OrderedDict()
+
+# Embedders resolved by model ID, reused for EMBEDDER_LOOKUP_TTL seconds
+# without looking the model up again
+EMBEDDER_LOOKUP_TTL = 300
+_embedder_by_model_id: Dict[str, Tuple[Embeddings, float]] = {}
+
+
+def invalidate_embedders() -> None:
+    """Drop cached embedders so provider or model changes take effect"""
+    _embedder_cache.clear()
+    _embedder_by_model_id.clear()
+
+
+# Texts are embedded in sub-batches of this size, sent concurrently
+EMBEDDING_SUB_BATCH_SIZE = 64
+
+# Connection pool shared by all OpenAI-compatible embedders, sized for the
+# concurrent sub-batch requests issued during ingestion
+EMBEDDING_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+EMBEDDING_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(limits=EMBEDDING_HTTP_LIMITS, timeout=EMBEDDING_HTTP_TIMEOUT)
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(limits=EMBEDDING_HTTP_LIMITS, timeout=EMBEDDING_HTTP_TIMEOUT)
+    return _http_client, _http_async_client
+
+
+async def close_embedding_http_clients() -> None:
+    """Close the shared embedding HTTP clients and drop embedders using them"""
+    global _http_client, _http_async_client
+    invalidate_embedders()
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
+        _http_async_client = None
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
+# Max number of query vectors kept in process memory in front of the
+# embedding_cache table
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+# embedding_cache rows older than this are pruned, at most once per
+# EMBEDDING_CACHE_PRUNE_INTERVAL seconds per process
+EMBEDDING_CACHE_TTL = timedelta(days=30)
+EMBEDDING_CACHE_PRUNE_INTERVAL = 3600
+_last_cache_prune = 0.0
+
+# Rows collected instead of written while inside defer_embedding_cache_writes()
+_deferred_cache_rows: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "deferred_embedding_cache_rows", default=None
+)
+
+
+async def _write_cache_rows(rows: List[Dict[str, Any]]) -> None:
+    """Persist cache rows, skipping hashes another writer stored first"""
+    global _last_cache_prune
+    try:
+        async with async_session_maker() as session:
+            dialect = session.bind.dialect.name
+            if dialect == "postgresql":
+                stmt = postgresql.insert(EmbeddingCache).on_conflict_do_nothing()
+            elif dialect == "sqlite":
+                stmt = sqlite.insert(EmbeddingCache).on_conflict_do_nothing()
+            else:
+                stmt = insert(EmbeddingCache).prefix_with("IGNORE", dialect="mysql")
+            await session.execute(stmt, rows)
+            if time.monotonic() - _last_cache_prune > EMBEDDING_CACHE_PRUNE_INTERVAL:
+                _last_cache_prune = time.monotonic()
+                await session.execute(
+                    delete(EmbeddingCache).where(
+                        EmbeddingCache.created_at < datetime.now(timezone.utc) - EMBEDDING_CACHE_TTL
+                    )
+                )
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Failed to write embedding cache: {e}")
+
+
+@asynccontextmanager
+async def defer_embedding_cache_writes() -> AsyncIterator[None]:
+    """Hold back embedding cache writes made inside the block until it exits.
+
+    The cache is written through its own session; on SQLite that would wait
+    on the write lock held by a caller's open transaction, so callers that
+    embed mid-transaction commit inside the block and the rows are written
+    afterwards.
+    """
+    rows: List[Dict[str, Any]] = []
+    token = _deferred_cache_rows.set(rows)
+    try:
+        yield
+    finally:
+        _deferred_cache_rows.reset(token)
+        if rows:
+            await _write_cache_rows(rows)
+
+
+async def embed_documents_concurrently(
+    embedder: Embeddings,
+    texts: List[str],
+    batch_size: int = EMBEDDING_SUB_BATCH_SIZE,
+) -> List[List[float]]:
+    """Embed texts in concurrent sub-batches, returning vectors in input order.
+
+    Texts are grouped by length first so each request carries similarly sized
+    inputs, which keeps per-request latency (and padding on local models) even.
+    """
+    if len(texts) <= batch_size:
+        return await embedder.aembed_documents(texts)
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    sub_batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    results = await asyncio.gather(*(
+        embedder.aembed_documents([texts[i] for i in sub_batch])
+        for sub_batch in sub_batches
+    ))
+
+    vectors: List[List[float]] = [None] * len(texts)  # type: ignore[list-item]
+    for sub_batch, sub_vectors in zip(sub_batches, results):
+        for i, vector in zip(sub_batch, sub_vectors):
+            vectors[i] = vector
+    return vectors
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that reuses vectors stored in the embedding_cache table.
+
+    Vectors are keyed by the SHA-256 of model name, input type and text, so
+    re-ingesting unchanged chunks or repeating a query skips the provider call.
+    Query vectors are additionally kept in an in-process LRU.
+    """
+
+    def __init__(self, embedder: Embeddings, model_id: uuid.UUID, model_name: str):
+        self.embedder = embedder
+        self.model_id = model_id
+        self.model_name = model_name
+        self._query_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+    def _hash(self, kind: str, text: str) -> bytes:
+        # Providers may embed queries and documents differently, so the input
+        # type is part of the key
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode()).digest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedder.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self._hash("document", text) for text in texts]
+        cached = await self._load(set(hashes))
+
+        misses: Dict[bytes, str] = {h: t for h, t in zip(hashes, texts) if h not in cached}
+        if misses:
+            vectors = await self.embedder.aembed_documents(list(misses.values()))
+            new_entries = {
+                h: np.asarray(vector, dtype=np.float32)
+                for h, vector in zip(misses, vectors)
+            }
+            await self._store(new_entries)
+            cached.update(new_entries)
+
+        return [cached[h].tolist() for h in hashes]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        content_hash = self._hash("query", text)
+        vector = self._query_cache.get(content_hash)
+        if vector is not None:
+            self._query_cache.move_to_end(content_hash)
+            return vector.tolist()
+
+        vector = (await self._load({content_hash})).get(content_hash)
+        if vector is None:
+            vector = np.asarray(await self.embedder.aembed_query(text), dtype=np.float32)
+            await self._store({content_hash: vector})
+
+        self._query_cache[content_hash] = vector
+        if len(self._query_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return vector.tolist()
+
+    async def _load(self, hashes: set) -> Dict[bytes, np.ndarray]:
+        """Fetch cached vectors for the given hashes, ignoring cache failures"""
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    select(EmbeddingCache.content_hash, EmbeddingCache.vector).where(
+                        EmbeddingCache.model_id == self.model_id,
+                        EmbeddingCache.content_hash.in_(hashes),
+                    )
+                )
+                return {
+                    content_hash: np.frombuffer(vector, dtype=np.float32)
+                    for content_hash, vector in result.all()
+                }
+        except Exception as e:
+            logger.warning(f"Failed to read embedding cache: {e}")
+            return {}
+
+    async def _store(self, entries: Dict[bytes, np.ndarray]) -> None:
+        """Persist vectors, or collect them inside defer_embedding_cache_writes()"""
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "model_id": self.model_id,
+                "content_hash": content_hash,
+                "vector": vector.tobytes(),
+            }
+            for content_hash, vector in entries.items()
+        ]
+        deferred = _deferred_cache_rows.get()
+        if deferred is not None:
+            deferred.extend(rows)
+        else:
+            await _write_cache_rows(rows)
+
 
 class EmbeddingService:
     """Vector Embedding Service - Provides LangChain Embeddings instances based on model info"""
 
     def __init__(self):
         # Cache initialized embedders to avoid repeated construction
-        self._embedder_cache: Dict[str, Embeddings] = {}
+        self._embedder_cache = _embedder_cache
 
     async def get_embedder(self, model_id: str) -> Embeddings:
         """Get LangChain Embeddings instance by model ID"""
+        cached = _embedder_by_model_id.get(model_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
         model = await self._get_model_by_id(model_id)
         if not model:
             raise ValueError(f"Model not found: {model_id}")
@@ -29,7 +274,19 @@ class EmbeddingService:
         if "embedding" not in model.capabilities:
             raise ValueError(f"Model {model.name} does not support embedding")
 
-        return await self._get_embedder_for_model(model)
+        embedder = await self._get_embedder_for_model(model)
+        _embedder_by_model_id[model_id] = (embedder, time.monotonic() + EMBEDDER_LOOKUP_TTL)
+        return embedder
+    
+    async def warmup(self, model_ids: List[str]) -> None:
+        """Construct embedders for the given models ahead of the first request"""
+        results = await asyncio.gather(
+            *(self.get_embedder(model_id) for model_id in model_ids),
+            return_exceptions=True,
+        )
+        for model_id, result in zip(model_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to warm up embedder for model {model_id}: {result}")
     
     async def list_available_embedding_models(self) -> List[dict]:
         """Get all available embedding models"""
@@ -83,17 +340,24 @@ class EmbeddingService:
         if not provider:
             raise ValueError("Model provider not configured")
 
-        cache_key = f"{provider.id}:{model.name}"
-        if cache_key in self._embedder_cache:
-            return self._embedder_cache[cache_key]
+        # Provider updated_at is part of the key so that credential changes
+        # produce a fresh embedder instead of reusing the cached one
+        cache_key = f"{provider.id}:{provider.updated_at.timestamp()}:{model.name}"
+        cached = self._embedder_cache.get(cache_key)
+        if cached is not None:
+            self._embedder_cache.move_to_end(cache_key)
+            return cached
 
         embedder = await asyncio.to_thread(
             self._create_embedder,
             provider,
             model,
         )
+        embedder = CachedEmbeddings(embedder, model.id, model.name)
 
         self._embedder_cache[cache_key] = embedder
+        if len(self._embedder_cache) > EMBEDDER_CACHE_SIZE:
+            self._embedder_cache.popitem(last=False)
         return embedder
 
     def _create_embedder(self, provider: ModelProvider, model: Model) -> Embeddings:
@@ -103,7 +367,12 @@ class EmbeddingService:
         if interface_type == PROVIDER_INTERFACE_TYPES["OPENAI"]:
             from langchain_openai import OpenAIEmbeddings
 
-            kwargs = {"model": model.name}
+            http_client, http_async_client = _get_http_clients()
+            kwargs = {
+                "model": model.name,
+                "http_client": http_client,
+                "http_async_client": http_async_client,
+            }
             if provider.api_key:
                 kwargs["openai_api_key"] = provider.api_key
             if provider.api_base_url:
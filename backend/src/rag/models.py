@@ -1,6 +1,6 @@
 import uuid
 from typing import Optional, Dict, Any, TYPE_CHECKING
-from sqlalchemy import String, Text, Integer, JSON, ForeignKey
+from sqlalchemy import String, Text, Integer, JSON, ForeignKey, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models import Base
@@ -93,3 +93,26 @@ class DocumentChunk(Base):
     
     # Relationships
     document: Mapped["Document"] = relationship("Document", backref="chunks")
+
+
+class EmbeddingCache(Base):
+    """Embedding Cache Table - vectors keyed by SHA-256 of the embedded text"""
+    __tablename__ = "embedding_cache"
+
+    # Associated embedding model
+    model_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("models.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # SHA-256 digest of model name, input type and text
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+
+    # float32 vector bytes
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('model_id', 'content_hash', name='uq_embedding_cache_model_hash'),
+        # Serves the age-based prune of old entries
+        Index('ix_embedding_cache_created_at', 'created_at'),
+    )
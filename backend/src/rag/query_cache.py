@@ -0,0 +1,60 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+# Seconds a cached result stays valid; writes from other workers are only
+# picked up after expiry
+QUERY_CACHE_TTL = 60
+
+# Max cached (scope, query) results
+QUERY_CACHE_SIZE = 1024
+
+# (embedding model id, knowledge base ids, k)
+Scope = Tuple[str, Tuple[uuid.UUID, ...], int]
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold the query and collapse whitespace"""
+    return " ".join(query.casefold().split())
+
+
+class QueryResultCache:
+    """In-process LRU cache of vector search results.
+
+    Entries are keyed by scope and normalized query text, so only a repeat of
+    the same query over the same knowledge bases, model and k is served from
+    the cache; paraphrases are always searched.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple[Scope, str], Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, scope: Scope, query: str) -> Optional[Any]:
+        key = (scope, normalize_query(query))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if time.monotonic() > entry[0]:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, scope: Scope, query: str, results: Any) -> None:
+        key = (scope, normalize_query(query))
+        self._entries[key] = (time.monotonic() + QUERY_CACHE_TTL, results)
+        self._entries.move_to_end(key)
+        if len(self._entries) > QUERY_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, knowledge_base_id: uuid.UUID) -> None:
+        """Drop the results of every scope that includes the knowledge base"""
+        for key in [key for key in self._entries if knowledge_base_id in key[0][1]]:
+            del self._entries[key]
+
+
+query_result_cache = QueryResultCache()
@@ -1,22 +1,62 @@
+import os
 import uuid
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
-from langchain_core.documents import Document as VectorDocument
+from sqlalchemy import select, and_, insert
+from uuid_utils.compat import uuid7
+import orjson
+import numpy as np
 import logging
 import asyncio
 
 from .models import Document, DocumentChunk, KnowledgeBase
 from .schemas import RetrievalResult, RetrievalChunk
-from .embeddings import EmbeddingService
+from .embeddings import EmbeddingService, defer_embedding_cache_writes
 from .chunker import DocumentChunker
 from .content_extractor import DocumentContentExtractor
 from .vector_store import ChromaVectorStore
+from .query_cache import query_result_cache
 from src.files.service import FileService
 
 logger = logging.getLogger(__name__)
 
+# Max number of files downloaded/extracted concurrently in bulk ingestion
+EXTRACTION_CONCURRENCY = 16
+
+# Number of chunks written to the database and vector store per batch
+CHUNK_WRITE_BATCH_SIZE = 256
+
+# Extension to file type mapping
+EXT_TO_FILE_TYPE = {
+    '.txt': 'txt',
+    '.md': 'md',
+    '.markdown': 'md',
+    '.pdf': 'pdf',
+    '.doc': 'doc',
+    '.docx': 'docx',
+    '.xls': 'xls',
+    '.xlsx': 'xlsx',
+    '.ppt': 'ppt',
+    '.pptx': 'pptx',
+    '.csv': 'csv',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.html': 'html',
+    '.htm': 'html',
+    '.rtf': 'rtf',
+    '.odt': 'odt',
+    '.ods': 'ods',
+    '.odp': 'odp',
+}
+
+
+@lru_cache(maxsize=2048)
+def _ext_to_file_type(ext: str) -> Optional[str]:
+    """Map a raw file extension (any case) to its file type"""
+    return EXT_TO_FILE_TYPE.get(ext.lower())
+
 
 class RAGService:
     """RAG Core Service"""
@@ -34,6 +74,11 @@ class RAGService:
             self.file_service = FileService(session)
         
         self.content_extractor = DocumentContentExtractor(self.file_service)
+        
+        # Knowledge bases already verified through this service instance, so
+        # bulk operations don't repeat the same permission query. Instances
+        # are created per request and must not be kept beyond one
+        self._kb_cache: Dict[Tuple[uuid.UUID, Optional[uuid.UUID]], KnowledgeBase] = {}
     
     def _infer_file_type(self, filename: Optional[str], file_path: Optional[str]) -> Optional[str]:
         """Infer file type from filename or path"""
@@ -46,33 +91,24 @@ class RAGService:
             return None
         
         # Extract file extension
-        from pathlib import Path
-        ext = Path(target_name).suffix.lower()
-        
-        # Extension to file type mapping
-        ext_mapping = {
-            '.txt': 'txt',
-            '.md': 'md',
-            '.markdown': 'md',
-            '.pdf': 'pdf',
-            '.doc': 'doc',
-            '.docx': 'docx',
-            '.xls': 'xls',
-            '.xlsx': 'xlsx',
-            '.ppt': 'ppt',
-            '.pptx': 'pptx',
-            '.csv': 'csv',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.html': 'html',
-            '.htm': 'html',
-            '.rtf': 'rtf',
-            '.odt': 'odt',
-            '.ods': 'ods',
-            '.odp': 'odp',
-        }
-        
-        return ext_mapping.get(ext)
+        return _ext_to_file_type(os.path.splitext(target_name)[1])
+    
+    async def warmup(self) -> None:
+        """Preload embedders used by active knowledge bases"""
+        result = await self.session.execute(
+            select(KnowledgeBase.embedding_model_id)
+            .where(
+                and_(
+                    KnowledgeBase.status == "ACTIVE",
+                    KnowledgeBase.embedding_model_id.is_not(None)
+                )
+            )
+            .distinct()
+        )
+        model_ids = [str(model_id) for model_id in result.scalars()]
+        if model_ids:
+            await self.embedding_service.warmup(model_ids)
+            logger.info(f"Warmed up {len(model_ids)} embedding models")
     
     async def create_knowledge_base(
         self,
@@ -85,17 +121,17 @@ class RAGService:
     ) -> KnowledgeBase:
         """Create knowledge base"""
         try:
-            # Check if name already exists
+            # Check if name already exists, without loading the row
             existing_kb = await self.session.execute(
-                select(KnowledgeBase).where(
+                select(KnowledgeBase.id).where(
                     and_(
                         KnowledgeBase.name == name,
                         KnowledgeBase.owner_id == owner_id,
                         KnowledgeBase.status == "ACTIVE"
                     )
-                )
+                ).limit(1)
             )
-            if existing_kb.scalar_one_or_none():
+            if existing_kb.first():
                 raise ValueError(f"Knowledge base with name '{name}' already exists")
             
             kb_data = {
@@ -147,6 +183,15 @@ class RAGService:
         owner_id: Optional[uuid.UUID] = None
     ) -> Optional[KnowledgeBase]:
         """Get specific knowledge base"""
+        cache_key = (kb_id, owner_id)
+        cached_kb = self._kb_cache.get(cache_key)
+        if cached_kb is not None:
+            # Cached objects are this session's own instances, so a soft
+            # delete made through the session shows up here
+            if cached_kb.status == "ACTIVE":
+                return cached_kb
+            del self._kb_cache[cache_key]
+        
         if owner_id is not None:
             # Query with permission check
             result = await self.session.execute(
@@ -168,8 +213,38 @@ class RAGService:
                     )
                 )
             )
-        return result.scalar_one_or_none()
+        kb = result.scalar_one_or_none()
+        if kb is not None:
+            self._kb_cache[cache_key] = kb
+        return kb
     
+    async def _resolve_file_source(
+        self,
+        file_path: str,
+        filename: Optional[str] = None,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """Resolve title, original filename and file type for a stored file"""
+        # Find corresponding file record from database to get original filename as title
+        file_record = await self.file_service.get_file_by_path(file_path)
+        return self._file_source_from_record(file_path, filename, file_record)
+
+    def _file_source_from_record(
+        self,
+        file_path: str,
+        filename: Optional[str],
+        file_record: Optional[Any],
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        if file_record:
+            title = file_record.filename
+            original_filename = file_record.filename
+        else:
+            # If file record not found, use passed filename or extract from path
+            title = filename or file_path.split('/')[-1]
+            original_filename = filename
+
+        file_type = self._infer_file_type(original_filename, file_path)
+        return title, original_filename, file_type
+
     async def add_document_from_file(
         self,
         file_path: str,
@@ -185,18 +260,7 @@ class RAGService:
             if not kb:
                 raise ValueError("Knowledge base not found or access denied")
             
-            # Find corresponding file record from database to get original filename as title
-            file_record = await self.file_service.get_file_by_path(file_path)
-            if file_record:
-                title = file_record.filename
-                original_filename = file_record.filename
-            else:
-                # If file record not found, use passed filename or extract from path
-                title = filename or file_path.split('/')[-1]
-                original_filename = filename
-            
-            # Infer file type
-            file_type = self._infer_file_type(original_filename, file_path)
+            title, original_filename, file_type = await self._resolve_file_source(file_path, filename)
             
             # Extract content from file path using content extractor
             _, content = await self.content_extractor.extract_from_file_path(
@@ -228,6 +292,72 @@ class RAGService:
             logger.error(f"Failed to add document from file: {e}")
             raise
     
+    async def add_documents_from_files(
+        self,
+        file_paths: List[str],
+        knowledge_base_id: uuid.UUID,
+        owner_id: uuid.UUID,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Add multiple documents to knowledge base from file paths.
+
+        File records are fetched with one query, downloads and content
+        extraction run concurrently (bounded by EXTRACTION_CONCURRENCY) and
+        large documents are chunked in the chunker's process pool; database
+        writes stay sequential because the session cannot be shared between
+        concurrent tasks.
+        """
+        try:
+            # Verify knowledge base exists and belongs to user
+            kb = await self.get_knowledge_base(knowledge_base_id, owner_id)
+            if not kb:
+                raise ValueError("Knowledge base not found or access denied")
+            
+            # One query for all file records instead of one per path
+            file_records = await self.file_service.get_files_by_paths(file_paths)
+            sources = [
+                self._file_source_from_record(file_path, None, file_records.get(file_path))
+                for file_path in file_paths
+            ]
+            
+            semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
+            
+            async def extract(file_path: str, original_filename: Optional[str]) -> str:
+                async with semaphore:
+                    _, content = await self.content_extractor.extract_from_file_path(
+                        file_path, original_filename
+                    )
+                    return content
+            
+            contents = await asyncio.gather(*(
+                extract(file_path, original_filename)
+                for file_path, (_, original_filename, _) in zip(file_paths, sources)
+            ))
+            
+            documents = []
+            for file_path, (title, original_filename, file_type), content in zip(file_paths, sources, contents):
+                combined_metadata = {
+                    "source_type": "file",
+                    "original_filename": original_filename,
+                    **(metadata or {})
+                }
+                documents.append(await self.add_document(
+                    title=title,
+                    content=content,
+                    knowledge_base_id=knowledge_base_id,
+                    owner_id=owner_id,
+                    file_path=file_path,
+                    file_type=file_type,
+                    metadata=combined_metadata
+                ))
+            
+            logger.info(f"Added {len(documents)} documents from files to knowledge base {knowledge_base_id}")
+            return documents
+            
+        except Exception as e:
+            logger.error(f"Failed to add documents from files: {e}")
+            raise
+    
     async def add_document(
         self,
         title: str,
@@ -240,91 +370,175 @@ class RAGService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Document:
         """Add document to knowledge base"""
-        try:
-            # Verify knowledge base exists and belongs to user
-            kb = await self.get_knowledge_base(knowledge_base_id, owner_id)
-            if not kb:
-                raise ValueError("Knowledge base not found or access denied")
+        # Embedding cache rows are written once the document transaction has
+        # ended, so they do not wait on its write lock (SQLite)
+        async with defer_embedding_cache_writes():
+            added_vector_ids: List[str] = []
+            try:
+                # Verify knowledge base exists and belongs to user
+                kb = await self.get_knowledge_base(knowledge_base_id, owner_id)
+                if not kb:
+                    raise ValueError("Knowledge base not found or access denied")
+            
+                # If file_type not provided, try to infer from file path
+                if not file_type and (file_path or source_url):
+                    file_type = self._infer_file_type(None, file_path or source_url)
+            
+                # Create document record
+                document = Document(
+                    title=title,
+                    content=content,
+                    knowledge_base_id=knowledge_base_id,
+                    owner_id=owner_id,
+                    source_url=source_url,
+                    file_path=file_path,
+                    file_type=file_type,
+                    doc_metadata=metadata or {}
+                )
             
-            # If file_type not provided, try to infer from file path
-            if not file_type and (file_path or source_url):
-                file_type = self._infer_file_type(None, file_path or source_url)
+                self.session.add(document)
+                await self.session.flush()
             
-            # Create document record
-            document = Document(
-                title=title,
-                content=content,
-                knowledge_base_id=knowledge_base_id,
-                owner_id=owner_id,
-                source_url=source_url,
-                file_path=file_path,
-                file_type=file_type,
-                doc_metadata=metadata or {}
-            )
-            
-            self.session.add(document)
-            await self.session.flush()
+                # Stringified once, reused for every chunk below
+                document_id = str(document.id)
+                kb_id = str(knowledge_base_id)
             
-            # Chunk document
-            chunks = self.chunker.chunk_document(
-                content,
-                chunk_size=kb.chunk_size,
-                chunk_overlap=kb.chunk_overlap,
-                metadata={"document_id": str(document.id), "title": title}
-            )
+                # Chunk document
+                chunks = await self.chunker.achunk_document(
+                    content,
+                    chunk_size=kb.chunk_size,
+                    chunk_overlap=kb.chunk_overlap,
+                    metadata={"document_id": document_id, "title": title}
+                )
             
-            logger.info(f"Split document into {len(chunks)} chunks")
+                logger.info(f"Split document into {len(chunks)} chunks")
             
-            if not kb.embedding_model_id:
-                raise ValueError("Knowledge base embedding model is not configured")
+                if not kb.embedding_model_id:
+                    raise ValueError("Knowledge base embedding model is not configured")
 
-            embedder = await self.embedding_service.get_embedder(
-                model_id=str(kb.embedding_model_id)
-            )
-            # Save document chunks to database
-            chunk_records = []
-            for i, chunk in enumerate(chunks):
-                chunk_record = DocumentChunk(
-                    content=chunk.content,
-                    chunk_index=i,
-                    token_count=chunk.token_count,
-                    document_id=document.id,
-                    chunk_metadata=chunk.metadata
+                embedder = await self.embedding_service.get_embedder(
+                    model_id=str(kb.embedding_model_id)
                 )
-                chunk_records.append(chunk_record)
-                self.session.add(chunk_record)
-            
-            await self.session.flush()
+                # Persist chunks and vectors batch by batch so that ORM objects and
+                # vector documents of the whole document are never held at once
+                collection_name = f"kb_{knowledge_base_id}"
+                # On SQLite a batch's vectors are written before its rows, so
+                # the embedder's cache reads on another connection never run
+                # alongside this session's inserts
+                overlap_writes = self.session.get_bind().dialect.name != "sqlite"
+                for batch_start in range(0, len(chunks), CHUNK_WRITE_BATCH_SIZE):
+                    batch = chunks[batch_start:batch_start + CHUNK_WRITE_BATCH_SIZE]
+                
+                    # Save document chunks to database. IDs are generated
+                    # client-side as time-ordered UUIDv7, so inserts append to the
+                    # primary key index instead of splitting random pages
+                    chunk_rows = [
+                        {
+                            "id": uuid7(),
+                            "content": chunk.content,
+                            "chunk_index": i,
+                            "token_count": chunk.token_count,
+                            "document_id": document.id,
+                            "chunk_metadata": chunk.metadata,
+                        }
+                        for i, chunk in enumerate(batch, start=batch_start)
+                    ]
 
-            vector_documents = []
-            for chunk_record in chunk_records:
-                vector_documents.append(VectorDocument(
-                    id = str(chunk_record.id),
-                    page_content = chunk_record.content,
-                    metadata = {
-                        'chunk_id': str(chunk_record.id),
-                        'document_id': str(document.id),
-                        'chunk_index': chunk_record.chunk_index,
-                        'knowledge_base_id': str(knowledge_base_id),
-                        'title': title,
-                        **chunk_record.chunk_metadata
-                    }
-                ))            
-            collection_name = f"kb_{knowledge_base_id}"
-            await self.vector_store.add_documents(
-                collection_name=collection_name,
-                documents=vector_documents,
-                embedding_function=embedder,
+                    ids = [str(row["id"]) for row in chunk_rows]
+                    texts = [row["content"] for row in chunk_rows]
+                    metadatas = [
+                        {
+                            'chunk_id': chunk_id,
+                            'document_id': document_id,
+                            'chunk_index': row["chunk_index"],
+                            'knowledge_base_id': kb_id,
+                            'title': title,
+                            **row["chunk_metadata"]
+                        }
+                        for chunk_id, row in zip(ids, chunk_rows)
+                    ]
+                    add_vectors = self.vector_store.add_texts(
+                        collection_name=collection_name,
+                        ids=ids,
+                        texts=texts,
+                        metadatas=metadatas,
+                        embedding_function=embedder,
+                    )
+                    if overlap_writes:
+                        # Chunk IDs are known up front, so the database insert and the
+                        # embedding + vector store write of a batch run concurrently
+                        insert_result, vector_result = await asyncio.gather(
+                            self._insert_chunk_rows(chunk_rows),
+                            add_vectors,
+                            return_exceptions=True,
+                        )
+                        if not isinstance(vector_result, BaseException):
+                            added_vector_ids.extend(ids)
+                        for batch_result in (insert_result, vector_result):
+                            if isinstance(batch_result, BaseException):
+                                raise batch_result
+                    else:
+                        await add_vectors
+                        added_vector_ids.extend(ids)
+                        await self._insert_chunk_rows(chunk_rows)
+            
+                await self.session.commit()
+                query_result_cache.invalidate(knowledge_base_id)
+                logger.info(f"Added document '{title}' to knowledge base {knowledge_base_id}")
+                return document
+            
+            except Exception as e:
+                await self.session.rollback()
+                if added_vector_ids:
+                    # Don't leave vectors behind for chunks that were rolled back
+                    try:
+                        await self.vector_store.delete_documents(
+                            f"kb_{knowledge_base_id}", added_vector_ids
+                        )
+                    except Exception as cleanup_error:
+                        logger.error(f"Failed to clean up vectors of failed document: {cleanup_error}")
+                    query_result_cache.invalidate(knowledge_base_id)
+                logger.error(f"Failed to add document: {e}")
+                raise
+    
+    async def _insert_chunk_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert document chunk rows, using binary COPY on PostgreSQL"""
+        connection = await self.session.connection()
+        if connection.dialect.name == "postgresql":
+            # COPY bypasses ORM defaults, so timestamps are set explicitly
+            now = datetime.now(timezone.utc)
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                DocumentChunk.__tablename__,
+                records=[
+                    (
+                        row["id"],
+                        now,
+                        now,
+                        row["content"],
+                        row["chunk_index"],
+                        row["token_count"],
+                        row["document_id"],
+                        orjson.dumps(row["chunk_metadata"]).decode(),
+                    )
+                    for row in rows
+                ],
+                columns=[
+                    "id",
+                    "created_at",
+                    "updated_at",
+                    "content",
+                    "chunk_index",
+                    "token_count",
+                    "document_id",
+                    "chunk_metadata",
+                ],
             )
-            
-            await self.session.commit()
-            logger.info(f"Added document '{title}' to knowledge base {knowledge_base_id}")
-            return document
-            
-        except Exception as e:
-            await self.session.rollback()
-            logger.error(f"Failed to add document: {e}")
-            raise
+            return
+        
+        # A single bulk INSERT without per-object ORM bookkeeping; chunk ids
+        # are generated up front so nothing needs to be returned
+        await self.session.execute(insert(DocumentChunk), rows)
     
     async def get_documents(
         self,
@@ -405,7 +619,6 @@ class RAGService:
             # Get document
             result = await self.session.execute(
                 select(Document)
-                .options(selectinload(Document.chunks))
                 .where(
                     and_(
                         Document.id == document_id,
@@ -421,7 +634,11 @@ class RAGService:
             
             # Delete from vector database
             collection_name = f"kb_{document.knowledge_base_id}"
-            chunk_ids = [str(chunk.id) for chunk in document.chunks]
+            # Only chunk IDs are needed, don't hydrate full chunk rows
+            chunk_id_result = await self.session.execute(
+                select(DocumentChunk.id).where(DocumentChunk.document_id == document_id)
+            )
+            chunk_ids = [str(chunk_id) for chunk_id in chunk_id_result.scalars()]
             
             if chunk_ids:
                 await self.vector_store.delete_documents(collection_name, chunk_ids)
@@ -430,6 +647,7 @@ class RAGService:
             document.status = "DELETED"
             
             await self.session.commit()
+            query_result_cache.invalidate(document.knowledge_base_id)
             logger.info(f"Deleted document {document_id}")
             return True
             
@@ -439,52 +657,43 @@ class RAGService:
             raise
 
 
-    async def _relevance_search_with_score(
+    async def _search_group_by_vector(
         self,
         query: str,
-        knowledge_base_id: uuid.UUID,
+        embedding_model_id: uuid.UUID,
+        kb_ids: List[uuid.UUID],
         k: int,
-        kb_obj: KnowledgeBase,
-    ) -> List[Any]: # List[Tuple[Document, float]]
-        """Helper for scored search"""
-        if not kb_obj.embedding_model_id:
-            return []
-            
-        collection_name = f"kb_{knowledge_base_id}"
-        embedding_model_id = str(kb_obj.embedding_model_id)
-        embedder = await self.embedding_service.get_embedder(embedding_model_id)
-        
-        return await self.vector_store.similarity_search_with_score(
-            collection_name=collection_name,
-            query=query,
-            k=k,
-            embedding_function=embedder
+    ) -> List[Any]: # List[List[Tuple[Document, float]] | Exception]
+        """Embed the query once and search every KB that shares the embedding model"""
+        # Repeats of the same query over the same KBs reuse the previous results
+        scope = (str(embedding_model_id), tuple(kb_ids), k)
+        cached = query_result_cache.get(scope, query)
+        if cached is not None:
+            return cached
+
+        try:
+            embedder = await self.embedding_service.get_embedder(str(embedding_model_id))
+            embedding = await embedder.aembed_query(query)
+        except Exception as e:
+            return [e] * len(kb_ids)
+
+        results = await asyncio.gather(
+            *(
+                self.vector_store.similarity_search_by_vector_with_score(
+                    collection_name=f"kb_{kb_id}",
+                    embedding=embedding,
+                    k=k,
+                )
+                for kb_id in kb_ids
+            ),
+            return_exceptions=True,
         )
+        if not any(isinstance(result, Exception) for result in results):
+            query_result_cache.put(scope, query, results)
+        return results
 
     # Legacy method replaced by retrieve_multi
     # async def relevance_search(...)
-            
-    async def retrieve_multi(
-        self,
-        query: str,
-        knowledge_base_id: uuid.UUID,
-        k: int,
-        kb_obj: KnowledgeBase,
-    ) -> List[Any]: # List[Tuple[Document, float]]
-        """Helper for scored search"""
-        if not kb_obj.embedding_model_id:
-            return []
-            
-        collection_name = f"kb_{knowledge_base_id}"
-        embedding_model_id = str(kb_obj.embedding_model_id)
-        embedder = await self.embedding_service.get_embedder(embedding_model_id)
-        
-        return await self.vector_store.similarity_search_with_score(
-            collection_name=collection_name,
-            query=query,
-            k=k,
-            embedding_function=embedder
-        )
 
     async def retrieve_multi(
         self,
@@ -496,71 +705,71 @@ class RAGService:
         """
         Execute RAG retrieval across multiple Knowledge Bases with global Reranking.
         """
-        all_chunks: List[RetrievalChunk] = []
-        
         # Pre-fetch KnowledgeBase objects
         stmt = select(KnowledgeBase).where(KnowledgeBase.id.in_(knowledge_base_ids))
         result = await self.session.execute(stmt)
         kbs = result.scalars().all()
-        kb_map = {kb.id: kb for kb in kbs}
 
-        # Create tasks (using score-based search)
-        tasks = []
-        valid_kb_ids = [] # keep track of order
-        
-        for kb_id in knowledge_base_ids:
-            kb = kb_map.get(kb_id)
-            if kb:
-                # We request top_k from EACH KB to ensure we have enough candidates
-                # Since we will global sort later.
-                tasks.append(self._relevance_search_with_score(query, kb_id, k=top_k, kb_obj=kb))
-                valid_kb_ids.append(kb_id)
-        
-        if not tasks:
+        # Group KBs by embedding model so the query is embedded once per model
+        groups: Dict[uuid.UUID, List[uuid.UUID]] = {}
+        for kb in kbs:
+            if kb.embedding_model_id:
+                groups.setdefault(kb.embedding_model_id, []).append(kb.id)
+
+        if not groups:
             return RetrievalResult(query=query, chunks=[])
 
-        # Execute all searches
-        results_list = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for i, result in enumerate(results_list):
-            kb_id = valid_kb_ids[i]
-            
-            if isinstance(result, Exception):
-                logger.warning(f"Error retrieving from KB {kb_id}: {result}")
-                continue
-                
-            if not result:
-                continue
-            
-            # Result is List[Tuple[Document, float]]
-            for doc, score in result:
-                # Filter by score threshold if provided
-                if score_threshold is not None and score < score_threshold:
-                    continue
+        # Execute all searches (using score-based search)
+        # We request top_k from EACH KB to ensure we have enough candidates
+        # Since we will global sort later.
+        group_results = await asyncio.gather(*(
+            self._search_group_by_vector(query, model_id, group_kb_ids, k=top_k)
+            for model_id, group_kb_ids in groups.items()
+        ))
 
-                # Convert VectorDocument to RetrievalChunk
-                chunks_doc_id = None
-                if doc.metadata and "doc_id" in doc.metadata:
-                    try:
-                        chunks_doc_id = uuid.UUID(doc.metadata["doc_id"])
-                    except (ValueError, TypeError):
-                        pass
+        # Flatten candidates; Result is List[Tuple[Document, float]]
+        candidates: List[Tuple[Any, uuid.UUID]] = []
+        scores: List[float] = []
+        for group_kb_ids, results in zip(groups.values(), group_results):
+            for kb_id, result in zip(group_kb_ids, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error retrieving from KB {kb_id}: {result}")
+                    continue
 
-                chunk = RetrievalChunk(
-                    content=doc.page_content,
-                    metadata=doc.metadata or {},
-                    score=score,
-                    kb_id=kb_id,
-                    doc_id=chunks_doc_id
-                )
-                all_chunks.append(chunk)
+                for doc, score in result:
+                    candidates.append((doc, kb_id))
+                    scores.append(score)
 
         # Global Re-ranking (Sort by score descending)
         # Assuming scores are comparable (normalized relevance scores)
-        all_chunks.sort(key=lambda x: x.score if x.score is not None else -1.0, reverse=True)
-        
-        # Limit to top_k Global
-        final_chunks = all_chunks[:top_k]
+        score_array = np.asarray(scores, dtype=np.float64)
+        indices = np.arange(len(scores))
+        # Filter by score threshold if provided
+        if score_threshold is not None:
+            indices = indices[score_array >= score_threshold]
+        # Select the global top_k in linear time, then order only those
+        if len(indices) > top_k:
+            indices = indices[np.argpartition(-score_array[indices], top_k - 1)[:top_k]]
+        indices = indices[np.lexsort((indices, -score_array[indices]))]
+
+        # Convert only the selected VectorDocuments to RetrievalChunks
+        final_chunks: List[RetrievalChunk] = []
+        for i in indices:
+            doc, kb_id = candidates[i]
+            chunks_doc_id = None
+            if doc.metadata and "doc_id" in doc.metadata:
+                try:
+                    chunks_doc_id = uuid.UUID(doc.metadata["doc_id"])
+                except (ValueError, TypeError):
+                    pass
+
+            final_chunks.append(RetrievalChunk(
+                content=doc.page_content,
+                metadata=doc.metadata or {},
+                score=scores[i],
+                kb_id=kb_id,
+                doc_id=chunks_doc_id
+            ))
         
         return RetrievalResult(
             query=query,
@@ -573,17 +782,9 @@ class RAGService:
         Matches the style used in PromptBuilder.
         """
         context_entries = []
-        entry_index = 1
-        
-        for chunk in result.chunks:
+        for index, chunk in enumerate(result.chunks, 1):
             metadata = chunk.metadata or {}
-            # Try to get title from metadata, fallback to doc_id or "Untitled"
+            # Try to get title from metadata, fallback to source or "Untitled"
             title = metadata.get("title") or metadata.get("source") or "Untitled Document"
-            content = chunk.content or ""
-            
-            context_entries.append(
-                f"[Reference {entry_index}] (Document {title})\n{content}"
-            )
-            entry_index += 1
-            
+            context_entries.append(f"[Reference {index}] (Document {title})\n{chunk.content or ''}")
         return "\n\n".join(context_entries)
\ No newline at end of file
@@ -1,16 +1,49 @@
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
+import chromadb
+import numpy as np
 from langchain_chroma import Chroma
 from langchain_core.embeddings import Embeddings
 from langchain_core.documents import Document as VectorDocument
 from langchain_core.vectorstores import VectorStoreRetriever
 
 from src.config import settings, ChromaClientType
+from .embeddings import embed_documents_concurrently
 
 
 logger = logging.getLogger(__name__)
 
+# Max number of collection handles kept open per process
+COLLECTION_CACHE_SIZE = 256
+
+# Deletes are split into batches of this size, at most DELETE_CONCURRENCY in flight
+DELETE_BATCH_SIZE = 500
+DELETE_CONCURRENCY = 4
+
+# MMR retrievers fetch min(k * MMR_FETCH_K_FACTOR, MMR_MAX_FETCH_K) candidates
+MMR_FETCH_K_FACTOR = 4
+MMR_MAX_FETCH_K = 50
+
+# Chroma client and collection handles are shared by all ChromaVectorStore
+# instances, so requests don't reopen the client and re-resolve the collection
+_client: Optional[Any] = None
+_collection_cache: "OrderedDict[Tuple[str, int], Chroma]" = OrderedDict()
+
+
+def close_vector_store() -> None:
+    """Drop cached collection handles and close the shared Chroma client"""
+    global _client
+    _collection_cache.clear()
+    if _client is not None:
+        try:
+            _client.close()
+        except Exception as exc:
+            logger.warning("Failed to close Chroma client: %s", exc)
+        _client = None
+
 
 class ChromaVectorStore:
     """Encapsulate Chroma vector store operations"""
@@ -22,25 +55,41 @@ class ChromaVectorStore:
         self.persist_directory = str(settings.CHROMA_PERSIST_DIRECTORY or (settings.STORAGE_DIR / "chroma_db"))
 
 
+    def _get_client(self) -> Any:
+        global _client
+        if _client is None:
+            if self.client_type == ChromaClientType.PERSISTENT:
+                _client = chromadb.PersistentClient(path=self.persist_directory)
+            else:
+                _client = chromadb.HttpClient(host=self.host, port=self.port)
+        return _client
+
     def _get_collection(
         self,
         collection_name: str,
         embedding_function: Optional[Embeddings] = None,
     ) -> Chroma:
+        # The cached handle keeps a reference to embedding_function, so its id
+        # cannot be reused by another object while the entry is alive
+        cache_key = (collection_name, id(embedding_function))
+        collection = _collection_cache.get(cache_key)
+        if collection is not None:
+            _collection_cache.move_to_end(cache_key)
+            return collection
+
         kwargs: Dict[str, Any] = {
             "collection_name": collection_name,
+            "client": self._get_client(),
         }
-        
-        if self.client_type == ChromaClientType.PERSISTENT:
-            kwargs["persist_directory"] = self.persist_directory
-        else:
-            kwargs["host"] = self.host
-            kwargs["port"] = self.port
             
         if embedding_function is not None:
             kwargs["embedding_function"] = embedding_function
 
-        return Chroma(**kwargs)
+        collection = Chroma(**kwargs)
+        _collection_cache[cache_key] = collection
+        if len(_collection_cache) > COLLECTION_CACHE_SIZE:
+            _collection_cache.popitem(last=False)
+        return collection
     
 
     async def get_retriever(
@@ -53,6 +102,14 @@ class ChromaVectorStore:
             collection_name,
             embedding_function=embedding_function,
         )
+        if kwargs.get("search_type") == "mmr":
+            # Bound the MMR candidate pool: a smaller fetch_k means fewer HNSW
+            # visits per query at the cost of slightly less diverse results
+            search_kwargs = dict(kwargs.get("search_kwargs") or {})
+            k = search_kwargs.setdefault("k", 4)
+            search_kwargs.setdefault("fetch_k", min(k * MMR_FETCH_K_FACTOR, MMR_MAX_FETCH_K))
+            search_kwargs.setdefault("lambda_mult", 0.5)
+            kwargs["search_kwargs"] = search_kwargs
         retriever = collection.as_retriever(**kwargs)
         return retriever
 
@@ -81,6 +138,26 @@ class ChromaVectorStore:
             k=k
         )
         return results
+
+    async def similarity_search_by_vector_with_score(
+        self,
+        collection_name: str,
+        embedding: List[float],
+        k: int,
+    ) -> List[tuple[VectorDocument, float]]:
+        """
+        Run similarity search with score for a pre-computed query embedding
+        """
+        collection = self._get_collection(collection_name)
+        # Chroma returns raw distances here, so convert them with the same
+        # relevance function asimilarity_search_with_relevance_scores applies
+        results = await asyncio.to_thread(
+            collection.similarity_search_by_vector_with_relevance_scores,
+            embedding=embedding,
+            k=k
+        )
+        relevance_score_fn = collection._select_relevance_score_fn()
+        return [(doc, relevance_score_fn(score)) for doc, score in results]
     
 
     async def add_documents(
@@ -97,12 +174,13 @@ class ChromaVectorStore:
             embedding_function=embedding_function,
         )
 
-        # Ensure each document has valid string content
-        for doc in documents:
-            if not isinstance(doc.page_content, str):
-                raise ValueError(f"Document content must be a string, got {type(doc.page_content)}")
-            if not doc.page_content.strip():
-                raise ValueError("Document content cannot be empty")
+        # Ensure each document has valid string content; isspace() checks for
+        # blank content without allocating a stripped copy
+        invalid = next((i for i, doc in enumerate(documents) if not isinstance(doc.page_content, str)), None)
+        if invalid is not None:
+            raise ValueError(f"Document content must be a string, got {type(documents[invalid].page_content)}")
+        if any(not doc.page_content or doc.page_content.isspace() for doc in documents):
+            raise ValueError("Document content cannot be empty")
 
         # Extract document IDs
         ids = [doc.id for doc in documents]
@@ -121,6 +199,80 @@ class ChromaVectorStore:
             raise
 
 
+    async def add_texts(
+        self,
+        collection_name: str,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embedding_function: Embeddings,
+    ) -> None:
+        """
+        Embed texts and write them with a single upsert on the Chroma
+        collection, without wrapping them in langchain Documents first
+        """
+        if not texts:
+            return
+
+        # Ensure each text is a valid string; isspace() checks for blank
+        # content without allocating a stripped copy
+        invalid = next((i for i, text in enumerate(texts) if not isinstance(text, str)), None)
+        if invalid is not None:
+            raise ValueError(f"Document content must be a string, got {type(texts[invalid])}")
+        if any(not text or text.isspace() for text in texts):
+            raise ValueError("Document content cannot be empty")
+
+        try:
+            embeddings = await embed_documents_concurrently(embedding_function, texts)
+        except Exception as exc:
+            logger.error(
+                "Failed to embed texts for Chroma collection %s: %s",
+                collection_name,
+                exc,
+            )
+            raise
+
+        await self.add_embeddings(
+            collection_name=collection_name,
+            ids=ids,
+            embeddings=embeddings,
+            texts=texts,
+            metadatas=metadatas,
+        )
+
+
+    async def add_embeddings(
+        self,
+        collection_name: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Write pre-computed embeddings with a single upsert on the Chroma collection"""
+        if not ids:
+            return
+
+        collection = self._get_collection(collection_name)
+
+        try:
+            await asyncio.to_thread(
+                collection._collection.upsert,
+                ids=ids,
+                # A contiguous float32 array is handed to Chroma without per-row conversion
+                embeddings=np.asarray(embeddings, dtype=np.float32),
+                documents=texts,
+                metadatas=metadatas,
+            )
+        except Exception as exc:
+            logger.error(
+                "Failed to add embeddings to Chroma collection %s: %s",
+                collection_name,
+                exc,
+            )
+            raise
+
+
     async def delete_documents(
         self,
         collection_name: str,
@@ -131,12 +283,22 @@ class ChromaVectorStore:
 
         collection = self._get_collection(collection_name)
 
+        # Delete in bounded batches to keep each Chroma write transaction small
+        semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def delete_batch(batch_ids: List[str]) -> None:
+            async with semaphore:
+                await collection.adelete(ids=batch_ids)
+
         try:
-            await collection.adelete(ids=ids)
+            await asyncio.gather(*(
+                delete_batch(ids[i:i + DELETE_BATCH_SIZE])
+                for i in range(0, len(ids), DELETE_BATCH_SIZE)
+            ))
         except Exception as exc:
             logger.error(
-                "Failed to delete documents %s from Chroma collection %s: %s",
-                ids,
+                "Failed to delete %d documents from Chroma collection %s: %s",
+                len(ids),
                 collection_name,
                 exc,
             )
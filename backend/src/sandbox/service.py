@@ -2,33 +2,122 @@
 Sandbox Service - Manages Docker containers for code execution.
 This is the default 'Managed' implementation using aiodocker.
 """
+import asyncio
 import logging
 import io
 import tarfile
+import time
 import uuid
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple, TypeVar
+import aiofiles
+import aiofiles.os
 import aiodocker
+from aiodocker.containers import DockerContainer
 from aiodocker.exceptions import DockerError
 
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Conversation containers are named CONTAINER_PREFIX + conversation_id; idle
+# pre-warmed containers carry the pool prefix until assigned
+CONTAINER_PREFIX = "riceball-sandbox-"
+POOL_CONTAINER_PREFIX = f"{CONTAINER_PREFIX}pool-"
+
+def _parse_memory_limit(limit: Any) -> int:
+    mem_limit = 512 * 1024 * 1024
+    if isinstance(limit, str):
+        s = limit.lower()
+        if s.endswith('g'):
+            mem_limit = int(float(s[:-1]) * 1024 * 1024 * 1024)
+        elif s.endswith('m'):
+            mem_limit = int(float(s[:-1]) * 1024 * 1024)
+    return mem_limit
+
+# Container config shared by every sandbox, resolved once from settings;
+# only the per-conversation work dir mount is added at creation time
+_CONTAINER_CONFIG: Dict[str, Any] = {
+    "Image": settings.SANDBOX_IMAGE_NAME,
+    "Cmd": ["sleep", "infinity"],
+    "HostConfig": {
+        "Memory": _parse_memory_limit(settings.SANDBOX_MEMORY_LIMIT),
+        "NanoCpus": int(settings.SANDBOX_CPU_LIMIT * 1e9),
+        "NetworkMode": "none" if not settings.SANDBOX_ENABLE_NETWORK else "bridge",
+    },
+    "WorkingDir": settings.SANDBOX_WORK_DIR,
+    "User": "sandbox",
+    "Tty": False,
+    "OpenStdin": False
+}
+
+# The docker client is re-created after this many API timeouts within the
+# window, since a wedged keep-alive connection can hang every later call
+DOCKER_TIMEOUT_TRIP = 2
+DOCKER_TIMEOUT_WINDOW = 10
+
+# USTAR header fields that are the same for every uploaded file: mode 0644,
+# uid/gid 0, mtime 0, regular file type; the checksum field is left blank
+_TAR_HEADER_TEMPLATE = bytearray(512)
+_TAR_HEADER_TEMPLATE[100:148] = b"0000644\0" + b"0000000\0" * 2 + b"\0" * 12 + b"00000000000\0"
+_TAR_HEADER_TEMPLATE[148:157] = b" " * 8 + b"0"
+_TAR_HEADER_TEMPLATE[257:265] = b"ustar\x0000"
+
+def build_single_file_tar(name: bytes, data: bytes) -> bytes:
+    """Build an uncompressed tar archive holding a single regular file.
+
+    put_archive only ever needs one small file, so the 512-byte USTAR header
+    is filled in from a template instead of going through tarfile.
+    """
+    if len(name) > 100:
+        # Long names need a GNU/PAX extension header, leave those to tarfile
+        tar_stream = io.BytesIO()
+        with tarfile.open(fileobj=tar_stream, mode='w') as tar:
+            info = tarfile.TarInfo(name=name.decode('utf-8'))
+            info.size = len(data)
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+        return tar_stream.getvalue()
+
+    header = bytearray(_TAR_HEADER_TEMPLATE)
+    header[:len(name)] = name
+    header[124:136] = b"%011o\0" % len(data)
+    header[148:156] = b"%06o\0 " % sum(header)
+    # Data is padded to a full block, then the archive ends with two zero blocks
+    return bytes(header) + data + bytes(-len(data) % 512 + 1024)
+
+async def read_exec_output(stream: Any) -> Tuple[bytes, bytes]:
+    """Collect stdout and stderr of an attached, non-TTY exec.
+
+    aiodocker parses Docker's 8-byte frame headers for such streams and tags
+    each message with its stream id (1 for stdout, 2 for stderr).
+    """
+    stdout, stderr = [], []
+    while (msg := await stream.read_out()) is not None:
+        (stderr if msg.stream == 2 else stdout).append(msg.data)
+    return b"".join(stdout), b"".join(stderr)
+
 class SandboxService:
     """
     Manages lightweight Docker containers for Python code execution.
-    Maintains a mapping of conversation_id -> container_id.
+    Containers are named after the conversation; handles of running ones are
+    cached per conversation_id so hot-path calls skip the lookup. A few idle
+    containers are kept warm and renamed when a new conversation needs one.
     """
     
-    # In-memory mapping removed, relying on Docker container names
-    
     def __init__(self):
+        # A single aiodocker client (and its aiohttp session / connection pool)
+        # is shared by all conversations; it is safe to use from concurrent tasks
         self._docker: Optional[aiodocker.Docker] = None
+        self._containers: Dict[str, DockerContainer] = {}
+        self._pool: list[DockerContainer] = []
+        self._pool_task: Optional[asyncio.Task] = None
+        self._timeouts: list[float] = []
     
-    @property
-    def docker(self) -> aiodocker.Docker:
-        """Lazy load docker client"""
-        # ... (keep existing implementation)
+    def connect(self) -> aiodocker.Docker:
+        """Create the shared docker client if it does not exist yet"""
         if self._docker is None:
              logger.debug("Initializing aiodocker client...")
              try:
@@ -38,26 +127,111 @@ class SandboxService:
                  logger.error(f"Failed to initialize aiodocker client: {e}")
                  raise
         return self._docker
+    
+    @property
+    def docker(self) -> aiodocker.Docker:
+        """Shared docker client, created on first use if startup could not connect"""
+        return self.connect()
         
     async def close(self):
+        # Pooled containers are left running, the next start adopts them
+        if self._pool_task is not None:
+            self._pool_task.cancel()
+            self._pool_task = None
+        self._pool.clear()
+        self._containers.clear()
         if self._docker:
             await self._docker.close()
             self._docker = None
 
-    async def get_or_create_session(self, conversation_id: str) -> str:
-        """Get existing container ID or create a new one"""
+    async def _call(self, awaitable: Awaitable[T]) -> T:
+        """Await a Docker API call, bounded by SANDBOX_API_TIMEOUT.
+
+        Used for the short control calls, not for code execution itself.
+        Repeated timeouts re-create the docker client.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, settings.SANDBOX_API_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self._record_timeout()
+            raise
 
-        container_name = f"riceball-sandbox-{conversation_id}"
+    async def _record_timeout(self):
+        now = time.monotonic()
+        self._timeouts = [t for t in self._timeouts if now - t < DOCKER_TIMEOUT_WINDOW]
+        self._timeouts.append(now)
+        if len(self._timeouts) < DOCKER_TIMEOUT_TRIP:
+            return
+
+        logger.warning(f"Docker API timed out {len(self._timeouts)} times, re-creating the docker client")
+        self._timeouts.clear()
+        # Cached handles are bound to the old client, find them again through the new one
+        docker, self._docker = self._docker, None
+        self._containers.clear()
+        self._pool.clear()
+        if docker is not None:
+            try:
+                await docker.close()
+            except Exception as e:
+                logger.warning(f"Failed to close docker client: {e}")
+        self.warm_up()
+
+    async def _with_session(
+        self,
+        conversation_id: str,
+        operation: Callable[[DockerContainer], Awaitable[T]],
+    ) -> T:
+        """Run an operation against the conversation's container.
+
+        The cached container is trusted without asking Docker whether it is
+        still running; if the operation fails because it was removed or
+        stopped (404/409), the cache entry is dropped and the operation is
+        retried once on a freshly resolved container.
+        """
+        container = await self.get_or_create_session(conversation_id)
+        try:
+            return await operation(container)
+        except DockerError as e:
+            if e.status not in (404, 409):
+                raise
+            logger.info(f"Sandbox container for {conversation_id} is gone ({e.status}), recreating")
+            if self._containers.get(conversation_id) is container:
+                del self._containers[conversation_id]
+        container = await self.get_or_create_session(conversation_id)
+        return await operation(container)
+
+    def _io_dir(self, conversation_id: str) -> Optional[Path]:
+        """Backend-side path of the conversation's bind-mounted work dir, if enabled"""
+        if not settings.SANDBOX_HOST_IO_DIR:
+            return None
+        return Path(settings.SANDBOX_LOCAL_IO_DIR or settings.SANDBOX_HOST_IO_DIR) / conversation_id
+
+    def _io_bind(self, conversation_id: str) -> str:
+        return f"{settings.SANDBOX_HOST_IO_DIR.rstrip('/')}/{conversation_id}:{settings.SANDBOX_WORK_DIR}:rw"
+
+    async def get_or_create_session(self, conversation_id: str) -> DockerContainer:
+        """Get the running container for a conversation, creating it if needed"""
+        container = self._containers.get(conversation_id)
+        if container is not None:
+            return container
+
+        container_name = f"{CONTAINER_PREFIX}{conversation_id}"
         
         try:
             # Try to find by name
-            container = await self.docker.containers.get(container_name)
-            info = await container.show()
+            container = await self._call(self.docker.containers.get(container_name))
+            info = await self._call(container.show())
+            
+            # Containers created before the work dir mount was configured are
+            # replaced, so every cached container has the mount when enabled
+            binds = (info.get('HostConfig') or {}).get('Binds') or []
+            mounted = not settings.SANDBOX_HOST_IO_DIR or self._io_bind(conversation_id) in binds
             
-            if info['State']['Running']:
-                return container.id
+            if info['State']['Running'] and mounted:
+                self._containers[conversation_id] = container
+                return container
             else:
-                # Exists but stopped/exited, cleanup
+                # Exists but stopped/exited (or lacks the mount), cleanup
                 await self._remove_container(container.id)
         except DockerError as e:
             if e.status != 404:
@@ -66,40 +240,107 @@ class SandboxService:
             # If 404, it means not found, proceed to create
             pass
         
-        return await self._create_container(conversation_id, container_name)
+        container = await self._take_pooled_container(container_name)
+        if container is None:
+            container = await self._create_container(conversation_id, container_name)
+        self._containers[conversation_id] = container
+        return container
+
+    def _pool_size(self) -> int:
+        # Pooled containers cannot carry a per-conversation bind mount
+        return 0 if settings.SANDBOX_HOST_IO_DIR else settings.SANDBOX_POOL_SIZE
+
+    def warm_up(self):
+        """Adopt containers left by a previous run and fill the pool in the background"""
+        self._pool_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self):
+        await self.hydrate_from_daemon()
+        await self._fill_pool()
+
+    async def hydrate_from_daemon(self):
+        """Cache running conversation containers and adopt idle pooled ones.
+
+        A single list call replaces the per-conversation lookups the first
+        request of each conversation would otherwise do after a restart.
+        """
+        try:
+            containers = await self._call(self.docker.containers.list(
+                all=True, filters={"name": [CONTAINER_PREFIX]}
+            ))
+        except (DockerError, asyncio.TimeoutError) as e:
+            logger.warning(f"Failed to list sandbox containers: {e}")
+            return
+        for container in containers:
+            name = container["Names"][0].lstrip("/")
+            running = container["State"] == "running"
+            if name.startswith(POOL_CONTAINER_PREFIX):
+                if running and len(self._pool) < self._pool_size():
+                    self._pool.append(container)
+                else:
+                    await self._remove_container(container.id)
+            elif running and name.startswith(CONTAINER_PREFIX):
+                conversation_id = name[len(CONTAINER_PREFIX):]
+                # Containers lacking the work dir mount are left for
+                # get_or_create_session to replace
+                mounted = not settings.SANDBOX_HOST_IO_DIR or any(
+                    mount.get("Source") == f"{settings.SANDBOX_HOST_IO_DIR.rstrip('/')}/{conversation_id}"
+                    and mount.get("Destination") == settings.SANDBOX_WORK_DIR
+                    for mount in container["Mounts"] or []
+                )
+                if mounted:
+                    self._containers.setdefault(conversation_id, container)
+        logger.info(f"Found {len(self._containers)} running sandbox containers, {len(self._pool)} pooled")
+
+    async def _fill_pool(self):
+        while len(self._pool) < self._pool_size():
+            container_name = f"{POOL_CONTAINER_PREFIX}{uuid.uuid4().hex[:12]}"
+            try:
+                container = await self._create_container(None, container_name)
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm sandbox container: {e}")
+                return
+            self._pool.append(container)
+
+    async def _take_pooled_container(self, container_name: str) -> Optional[DockerContainer]:
+        """Rename an idle pooled container for a conversation and refill the pool"""
+        container = None
+        while self._pool:
+            candidate = self._pool.pop()
+            try:
+                await self._call(candidate.rename(container_name))
+                container = candidate
+                break
+            except (DockerError, asyncio.TimeoutError) as e:
+                logger.warning(f"Failed to assign pooled sandbox {candidate.id[:8]}: {e}")
+                await self._remove_container(candidate.id)
+        if self._pool_size() > 0 and (self._pool_task is None or self._pool_task.done()):
+            self._pool_task = asyncio.create_task(self._fill_pool())
+        if container is not None:
+            logger.info(f"Assigned pooled sandbox {container.id[:8]} (name={container_name})")
+        return container
     
-    async def _create_container(self, conversation_id: str, container_name: str) -> str:
+    async def _create_container(self, conversation_id: Optional[str], container_name: str) -> DockerContainer:
         """Start a new sandbox container"""
         try:
-            # Parse memory limit
-            mem_limit = 512 * 1024 * 1024
-            if isinstance(settings.SANDBOX_MEMORY_LIMIT, str):
-                s = settings.SANDBOX_MEMORY_LIMIT.lower()
-                if s.endswith('g'):
-                    mem_limit = int(float(s[:-1]) * 1024 * 1024 * 1024)
-                elif s.endswith('m'):
-                    mem_limit = int(float(s[:-1]) * 1024 * 1024)
-
-            config = {
-                "Image": settings.SANDBOX_IMAGE_NAME,
-                "Cmd": ["sleep", "infinity"],
-                "HostConfig": {
-                    "Memory": mem_limit,
-                    "NanoCpus": int(settings.SANDBOX_CPU_LIMIT * 1e9),
-                    "NetworkMode": "none" if not settings.SANDBOX_ENABLE_NETWORK else "bridge",
-                },
-                "WorkingDir": settings.SANDBOX_WORK_DIR,
-                "User": "sandbox",
-                "Tty": False,
-                "OpenStdin": False
-            }
+            config = _CONTAINER_CONFIG
+            
+            io_dir = self._io_dir(conversation_id) if conversation_id else None
+            if io_dir is not None:
+                io_dir.mkdir(parents=True, exist_ok=True)
+                # The sandbox user's uid differs from ours, let it write there
+                io_dir.chmod(0o777)
+                config = {
+                    **_CONTAINER_CONFIG,
+                    "HostConfig": {**_CONTAINER_CONFIG["HostConfig"], "Binds": [self._io_bind(conversation_id)]},
+                }
             
             # Use fixed name
-            container = await self.docker.containers.create(config=config, name=container_name)
-            await container.start()
+            container = await self._call(self.docker.containers.create(config=config, name=container_name))
+            await self._call(container.start())
             
             logger.info(f"Started sandbox {container.id[:8]} (name={container_name}) for {conversation_id}")
-            return container.id
+            return container
             
         except Exception as e:
             logger.error(f"Failed to create sandbox container: {e}")
@@ -107,8 +348,8 @@ class SandboxService:
 
     async def _remove_container(self, container_id: str):
         try:
-            container = await self.docker.containers.get(container_id)
-            await container.delete(force=True)
+            container = await self._call(self.docker.containers.get(container_id))
+            await self._call(container.delete(force=True))
         except Exception:
             pass
 
@@ -116,227 +357,124 @@ class SandboxService:
         """
         Execute Python code in the sandbox.
         """
-        container_id = await self.get_or_create_session(conversation_id)
-        container = await self.docker.containers.get(container_id)
-        
-        filename = f"exec_{uuid.uuid4().hex[:8]}.py"
-        
-        # 1. Upload code
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-            data = code.encode('utf-8')
-            info = tarfile.TarInfo(name=filename)
-            info.size = len(data)
-            info.mtime = 0 
-            tar.addfile(info, io.BytesIO(data))
-        tar_stream.seek(0)
-        
-        await container.put_archive(path=settings.SANDBOX_WORK_DIR, data=tar_stream)
-        
-        # 2. Execute via file redirection
-        run_cmd = f"python {filename} > {filename}.out 2> {filename}.err"
-        
-        exec_instance = await container.exec(
-            cmd=["/bin/sh", "-c", run_cmd],
-            workdir=settings.SANDBOX_WORK_DIR,
-            user="sandbox"
+        return await self._with_session(
+            conversation_id, lambda container: self._execute_code(container, code)
         )
+
+    async def _execute_code(self, container: DockerContainer, code: str) -> Dict[str, Any]:
+        # The code is piped to the interpreter over the exec's stdin and the
+        # output comes back on its demultiplexed stdout/stderr, so a run is a
+        # single exec with no script or output files. head stops after the
+        # script, which gives python EOF without half-closing the connection
+        data = code.encode('utf-8')
+        exec_instance = await self._call(container.exec(
+            cmd=["/bin/sh", "-c", f"head -c {len(data)} | python -"],
+            workdir=settings.SANDBOX_WORK_DIR,
+            user="sandbox",
+            stdin=True
+        ))
         
-        # Start and wait
+        # Start, send the code and wait, collecting the output
+        stdout, stderr = b"", b""
         try:
             async with exec_instance.start(detach=False) as stream:
-                # Need to read stream with aiodocker < 0.21 or > 0.14
-                if hasattr(stream, 'read_out'):
-                    await stream.read_out()
-                elif hasattr(stream, 'read'):
-                    # Some versions return Stream which we iterate or read
-                    await stream.read()
-                elif hasattr(stream, '__aiter__'):
-                     async for _ in stream: pass
+                await stream.write_in(data)
+                stdout, stderr = await read_exec_output(stream)
         except Exception:
             pass
         
         # Inspect for exit code
-        exec_info = await exec_instance.inspect()
+        exec_info = await self._call(exec_instance.inspect())
         exit_code = exec_info.get("ExitCode")
         
-        # 3. Read output files
-        stdout = await self._read_file(container, f"{filename}.out")
-        stderr = await self._read_file(container, f"{filename}.err")
-
-        # 4. Cleanup execution artifacts (script and logs), keep user files
-        try:
-            await container.exec(
-                cmd=["rm", filename, f"{filename}.out", f"{filename}.err"],
-                workdir=settings.SANDBOX_WORK_DIR,
-                user="sandbox"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to cleanup sandbox artifacts: {e}")
-        
         return {
-            "stdout": stdout,
-            "stderr": stderr,
+            "stdout": stdout.decode('utf-8', errors='replace'),
+            "stderr": stderr.decode('utf-8', errors='replace'),
             "exit_code": exit_code
         }
 
     async def upload_file(self, conversation_id: str, filename: str, data: bytes):
         """Upload a file to the sandbox working directory"""
-        container_id = await self.get_or_create_session(conversation_id)
-        container = await self.docker.containers.get(container_id)
-        
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-            info = tarfile.TarInfo(name=filename)
-            info.size = len(data)
-            info.mtime = 0 
-            tar.addfile(info, io.BytesIO(data))
-        tar_stream.seek(0)
-        
-        await container.put_archive(path=settings.SANDBOX_WORK_DIR, data=tar_stream)
+        await self._with_session(
+            conversation_id,
+            lambda container: self._upload_file(container, filename, data, self._io_dir(conversation_id)),
+        )
+
+    async def _upload_file(
+        self,
+        container: DockerContainer,
+        filename: str,
+        data: bytes,
+        io_dir: Optional[Path] = None,
+    ):
+        if io_dir is not None:
+            # Work dir is bind-mounted, write the file on the host directly
+            async with aiofiles.open(io_dir / filename, 'wb') as f:
+                await f.write(data)
+            return
+
+        tar_data = build_single_file_tar(filename.encode('utf-8'), data)
+        await self._call(container.put_archive(path=settings.SANDBOX_WORK_DIR, data=tar_data))
 
     async def list_files(self, conversation_id: str) -> list[str]:
         """List files in the working directory"""
-        container_id = await self.get_or_create_session(conversation_id)
-        container = await self.docker.containers.get(container_id)
-        
-        # simple ls with Tty=True to avoid raw stream headers and ensure clean text
-        exec_instance = await container.exec(
+        io_dir = self._io_dir(conversation_id)
+        if io_dir is not None:
+            # Work dir is bind-mounted, list it on the host without an exec;
+            # hidden entries are skipped like ls does
+            try:
+                names = await aiofiles.os.listdir(io_dir)
+            except FileNotFoundError:
+                return []
+            return sorted(name for name in names if not name.startswith('.'))
+        return await self._with_session(conversation_id, self._list_files)
+
+    async def _list_files(self, container: DockerContainer) -> list[str]:
+        exec_instance = await self._call(container.exec(
             cmd=["ls", "-1", settings.SANDBOX_WORK_DIR],
-            user="sandbox",
-            tty=True
-        )
+            user="sandbox"
+        ))
         
         output = b""
         try:
-             async with exec_instance.start(detach=False) as stream:
-                if hasattr(stream, 'read_out'):
-                    msg = await stream.read_out()
-                    if msg is not None:
-                        if hasattr(msg, 'data'):
-                            output = msg.data
-                        else:
-                            output = msg
-                elif hasattr(stream, 'read'):
-                    output = await stream.read()
-                elif hasattr(stream, '__aiter__'):
-                     async for chunk in stream: 
-                         if isinstance(chunk, bytes):
-                             output += chunk
-                         else:
-                             output += chunk.data
+            async with exec_instance.start(detach=False) as stream:
+                output, _ = await self._call(read_exec_output(stream))
         except Exception as e:
             logger.warning(f"Error listing files: {e}")
-            pass
             
         # Parse output (files separated by newline)
-        if isinstance(output, bytes):
-            # Remove potential control characters if TTY adds them
-            decoded = output.decode('utf-8', errors='ignore')
-            logger.debug(f"DEBUG: ls output (raw): {output!r}")
-            logger.debug(f"DEBUG: ls output (decoded): {decoded!r}")
-            files = decoded.splitlines()
-        else:
-            files = str(output).splitlines()
-            
+        files = output.decode('utf-8', errors='ignore').splitlines()
         return [f.strip() for f in files if f.strip()]
 
     async def read_file_bytes(self, conversation_id: str, filename: str) -> Optional[bytes]:
         """Read binary file content from container"""
-        container_id = await self.get_or_create_session(conversation_id)
-        container = await self.docker.containers.get(container_id)
-        
+        io_dir = self._io_dir(conversation_id)
         try:
-            tar_obj = await container.get_archive(f"{settings.SANDBOX_WORK_DIR}/{filename}")
-            
-            content = io.BytesIO()
-            if isinstance(tar_obj, bytes):
-                content.write(tar_obj)
-            elif hasattr(tar_obj, '__aiter__'):
-                async for chunk in tar_obj:
-                    content.write(chunk)
-            else:
-                 # Fallback for other types
-                 try:
-                     import tarfile
-                     if hasattr(tar_obj, 'extractfile'):
-                         for member in tar_obj:
-                             if member.isfile():
-                                 f = tar_obj.extractfile(member)
-                                 if f: return f.read()
-                 except: pass
-
-                 try:
-                     for chunk in tar_obj: content.write(chunk)
-                 except: pass
-
-            content.seek(0)
-            
-            with tarfile.open(fileobj=content, mode='r') as tar:
-                member = tar.next()
-                if member:
-                    f = tar.extractfile(member)
-                    if f:
-                        return f.read()
+            if io_dir is not None:
+                # Work dir is bind-mounted, read the file on the host directly
+                async with aiofiles.open(io_dir / filename, 'rb') as f:
+                    return await f.read()
+            return await self._with_session(
+                conversation_id,
+                lambda container: self._call(
+                    self._read_archive_file(container, f"{settings.SANDBOX_WORK_DIR}/{filename}")
+                ),
+            )
         except Exception as e:
             logger.warning(f"Failed to read binary file {filename}: {e}")
         return None
 
-    async def _read_file(self, container, filename: str) -> str:
-        """Read text file from container"""
-        try:
-            tar_obj = await container.get_archive(f"{settings.SANDBOX_WORK_DIR}/{filename}")
-            
-            content = io.BytesIO()
-            
-            # Handle different return types from aiodocker versions
-            if isinstance(tar_obj, bytes):
-                content.write(tar_obj)
-            elif hasattr(tar_obj, '__aiter__'):
-                async for chunk in tar_obj:
-                    content.write(chunk)
-            elif hasattr(tar_obj, 'read') or hasattr(tar_obj, 'extractfile'): # Sync stream or TarFile?
-                # If it's a TarFile object, we can't write it to BytesIO directly as bytes
-                import tarfile
-                if hasattr(tar_obj, 'extractfile'):
-                    # It behaves like a TarFile object
-                    try:
-                        # Iterate to find the first member (file)
-                        for member in tar_obj:
-                            if member.isfile():
-                                f = tar_obj.extractfile(member)
-                                if f: return f.read().decode('utf-8', errors='replace')
-                        return ""
-                    except Exception as e:
-                        logger.warning(f"Error extracting from TarFile object: {e}")
-                        return ""
-                else:
-                    # Sync read
-                    content.write(tar_obj.read())
-            else:
-                 # Attempt to iterate synchronously
-                 try:
-                     for chunk in tar_obj:
-                         content.write(chunk)
-                 except:
-                     logger.error(f"Unknown type returned from get_archive: {type(tar_obj)}")
-                     return ""
-
-            content.seek(0)
-            
-            try:
-                with tarfile.open(fileobj=content, mode='r') as tar:
-                    member = tar.next()
-                    if member:
-                        f = tar.extractfile(member)
-                        if f:
-                            return f.read().decode('utf-8', errors='replace')
-            except tarfile.ReadError:
-                 return ""
-            return ""
-        except Exception as e:
-            logger.warning(f"Failed to read file {filename}: {e} (Type: {type(tar_obj) if 'tar_obj' in locals() else 'unknown'})")
-            return ""
+    async def _read_archive_file(self, container: DockerContainer, path: str) -> Optional[bytes]:
+        """Read a file in the container through the archive endpoint.
+
+        get_archive on a single path yields one member; returns None if it
+        is not a regular file.
+        """
+        with await container.get_archive(path) as tar:
+            member = tar.next()
+            if member is None or not member.isfile():
+                return None
+            return tar.extractfile(member).read()
 
 # Global Singleton
 _sandbox_service_instance: Optional[SandboxService] = None
@@ -347,6 +485,13 @@ def get_sandbox_service() -> SandboxService:
         _sandbox_service_instance = SandboxService()
     return _sandbox_service_instance
 
+def init_sandbox_service() -> SandboxService:
+    """Create the sandbox service and its docker client at app startup"""
+    service = get_sandbox_service()
+    service.connect()
+    service.warm_up()
+    return service
+
 async def close_sandbox_service():
     global _sandbox_service_instance
     if _sandbox_service_instance:
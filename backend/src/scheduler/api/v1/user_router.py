@@ -26,7 +26,6 @@ async def create_scheduled_task(
     )
     session.add(task)
     await session.commit()
-    await session.refresh(task)
     
     if task.is_active:
         add_job_to_scheduler(task)
@@ -58,7 +57,6 @@ async def update_scheduled_task(
         setattr(task, field, value)
         
     await session.commit()
-    await session.refresh(task)
     
     # Sync Scheduler
     if task.is_active:
@@ -1,8 +1,11 @@
 import logging
+from functools import lru_cache
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
 from datetime import datetime
+from typing import Dict, Tuple
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import async_session_maker
@@ -14,6 +17,13 @@ logger = logging.getLogger(__name__)
 # Global Scheduler Instance
 scheduler = AsyncIOScheduler()
 
+# Schedule each job was last added with, keyed by task id, so a sync only
+# re-adds jobs whose task changed
+_job_specs: Dict[str, Tuple[str, str, str]] = {}
+
+def _job_spec(task: ScheduledTask) -> Tuple[str, str, str]:
+    return (task.cron_expression, task.timezone, task.name)
+
 async def start_scheduler():
     """Start the scheduler and load existing tasks"""
     logger.info("Starting APScheduler...")
@@ -26,19 +36,41 @@ async def start_scheduler():
 async def sync_scheduler_jobs(session: AsyncSession):
     """
     Sync DB tasks with Scheduler in-memory jobs.
-    Simple strategy: Remove all and re-add active ones.
+    Jobs of deleted or deactivated tasks are removed, and only new or
+    changed tasks (or jobs that already finished) are re-added.
     """
     logger.info("Syncing scheduled tasks...")
-    scheduler.remove_all_jobs()
     
     stmt = select(ScheduledTask).where(ScheduledTask.is_active == True)
     result = await session.execute(stmt)
-    tasks = result.scalars().all()
+    tasks = {str(task.id): task for task in result.scalars().all()}
+    
+    scheduled = {job.id for job in scheduler.get_jobs()}
+    for job_id in scheduled - tasks.keys():
+        remove_job_from_scheduler(job_id)
     
-    for task in tasks:
-        add_job_to_scheduler(task)
+    changed = [
+        task for job_id, task in tasks.items()
+        if job_id not in scheduled or _job_specs.get(job_id) != _job_spec(task)
+    ]
+    # A running scheduler wakes its loop for every added job; while paused
+    # the jobs are only stored and resume() wakes it once for the batch
+    paused = bool(changed) and scheduler.state == STATE_RUNNING
+    if paused:
+        scheduler.pause()
+    try:
+        for task in changed:
+            add_job_to_scheduler(task)
+    finally:
+        if paused:
+            scheduler.resume()
         
-    logger.info(f"Synced {len(tasks)} tasks.")
+    logger.info(f"Synced {len(tasks)} tasks ({len(changed)} added or updated).")
+
+@lru_cache(maxsize=2048)
+def _make_cron_trigger(cron_expression: str, timezone: str) -> CronTrigger:
+    """Parse a crontab expression; triggers are stateless, so jobs can share them"""
+    return CronTrigger.from_crontab(cron_expression, timezone=timezone)
 
 def add_job_to_scheduler(task: ScheduledTask):
     try:
@@ -61,7 +93,7 @@ def add_job_to_scheduler(task: ScheduledTask):
         else:
             # Note: from_crontab requires 5 fields.
             try:
-                trigger = CronTrigger.from_crontab(task.cron_expression, timezone=task.timezone)
+                trigger = _make_cron_trigger(task.cron_expression, task.timezone)
             except ValueError:
                 # Fallback or specific error logging
                  logger.error(f"Invalid Cron format for task {task.id}: {task.cron_expression}")
@@ -76,11 +108,13 @@ def add_job_to_scheduler(task: ScheduledTask):
                 args=[task.id],
                 name=task.name
             )
+            _job_specs[str(task.id)] = _job_spec(task)
             logger.info(f"Added job {task.id}: {task.name} ({task.cron_expression})")
     except Exception as e:
         logger.error(f"Failed to add job {task.id}: {e}")
 
 def remove_job_from_scheduler(task_id: str):
+    _job_specs.pop(task_id, None)
     try:
         scheduler.remove_job(task_id)
         logger.info(f"Removed job {task_id}")
@@ -1,47 +1,82 @@
 
 import asyncio
+import hashlib
 import logging
+import time
 import uuid
-from typing import Optional, AsyncGenerator
-from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, AsyncGenerator, Tuple
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, or_
 from sqlalchemy.orm import selectinload
 
 from src.database import async_session_maker
-from src.channels.models import ChannelConfig, UserChannelBinding, ChannelProvider
-from src.channels.services.telegram import TelegramChannelService
-from src.channels.services.wecom import WecomChannelService
-from src.channels.services.wecom_smart_bot import WecomSmartBotChannelService
-from src.channels.services.wecom_webhook import WecomWebhookChannelService
+from src.channels.models import ChannelConfig, UserChannelBinding
+from src.channels.services import get_channel_service_class
+from src.channels.services.base import coalesce_stream, get_channel_http_client
 
 from src.scheduler.models import ScheduledTask, ScheduledTaskExecution
 from src.assistants.models import Assistant
 from src.ai_models.models import Model
-from src.chat.engine import AIEngine
+
+if TYPE_CHECKING:
+    from src.chat.engine import AIEngine
 
 logger = logging.getLogger(__name__)
 
+# Incoming webhook messages are handled by a fixed pool of workers, each
+# draining its own bounded queue, so bursts don't open unbounded DB sessions
+INCOMING_MESSAGE_WORKERS = 8
+INCOMING_MESSAGE_QUEUE_SIZE = 128
+_incoming_queues: List["asyncio.Queue[Dict[str, Any]]"] = []
+_incoming_workers: List["asyncio.Task[None]"] = []
+
+# Provider message ids seen in the last INCOMING_MESSAGE_DEDUP_TTL seconds,
+# so webhook retries of a message already queued don't run it twice. Keyed
+# per sender too: ids like Telegram's message_id are only unique per chat
+INCOMING_MESSAGE_DEDUP_TTL = 300
+INCOMING_MESSAGE_DEDUP_SIZE = 4096
+_recent_message_ids: Dict[Tuple[uuid.UUID, str, str], float] = {}
+
+# A task whose last run started less than this long ago is not claimed again
+RUN_CLAIM_GUARD = timedelta(seconds=1)
+
+# Execution records keep this many leading characters of the response, plus
+# its full length and hash
+RESULT_PREVIEW_CHARS = 4096
+
+# Error messages stored on failed executions are truncated to this many
+# characters; the full exception is in the log
+ERROR_MESSAGE_MAX_CHARS = 4096
+
+# Channel and assistant rows resolved for a task are reused for
+# CHANNEL_CACHE_TTL seconds; edits made through the channel API invalidate
+# the entry immediately, other changes are picked up after expiry
+CHANNEL_CACHE_TTL = 30
+CHANNEL_CACHE_SIZE = 1024
+_channel_cache: Dict[Tuple[uuid.UUID, uuid.UUID], Tuple[ChannelConfig, Assistant, float]] = {}
+_channel_locks: Dict[Tuple[uuid.UUID, uuid.UUID], asyncio.Lock] = {}
+
+
+def invalidate_channel(channel_id: uuid.UUID) -> None:
+    """Drop cached channel/assistant pairs for the channel"""
+    for key in [key for key in _channel_cache if key[0] == channel_id]:
+        del _channel_cache[key]
+
 # Remove _get_active_conversation and _stream_response_generator helpers if not used elsewhere, or keep them.
 # I will keep _stream_response_generator but modify it or create a new one for AIEngine events.
 
 class ChannelServiceFactory:
     @staticmethod
     def get_service(channel: ChannelConfig):
-        if channel.provider == ChannelProvider.TELEGRAM:
-            return TelegramChannelService(channel)
-        elif channel.provider == ChannelProvider.WECOM:
-            return WecomChannelService(channel)
-        elif channel.provider == ChannelProvider.WECOM_SMART_BOT:
-            return WecomSmartBotChannelService(channel)
-        elif channel.provider == ChannelProvider.WECOM_WEBHOOK:
-            return WecomWebhookChannelService(channel)
-        else:
+        service_class = get_channel_service_class(channel.provider)
+        if service_class is None:
             raise NotImplementedError(f"Provider {channel.provider} not supported for task execution")
+        return service_class(channel, http=get_channel_http_client())
 
 async def _ai_engine_stream_adapter(
-    ai_engine: AIEngine,
+    ai_engine: "AIEngine",
     assistant: Assistant,
     prompt: str,
     context_id: uuid.UUID,
@@ -59,13 +94,65 @@ async def _ai_engine_stream_adapter(
         context_id=context_id,
         user_id=user_id
     ):
-        if event["type"] == "content_chunk":
-             content = event["data"].get("content", "")
+        event_type = event["type"]
+        if event_type == "content_chunk":
+             content = event["data"].get("content")
              if content:
                  yield content
-        elif event["type"] == "error":
+        elif event_type == "error":
              yield f"\n[System Error: {event['data'].get('error')}]"
 
+async def _load_channel(channel_id: uuid.UUID) -> Optional[ChannelConfig]:
+    async with async_session_maker() as session:
+        return await session.get(ChannelConfig, channel_id)
+
+async def _load_assistant(assistant_id: uuid.UUID) -> Optional[Assistant]:
+    async with async_session_maker() as session:
+        stmt = select(Assistant).options(
+            selectinload(Assistant.model).selectinload(Model.provider),
+            selectinload(Assistant.mcp_servers)
+        ).where(Assistant.id == assistant_id)
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+async def _load_channel_and_assistant(
+    channel_id: uuid.UUID,
+    assistant_id: uuid.UUID
+) -> Tuple[Optional[ChannelConfig], Optional[Assistant]]:
+    """
+    Resolve the channel and assistant a task runs with, served from the
+    in-process cache while the entry is fresh. On a miss both are loaded
+    concurrently, each in its own short-lived session, so the cached
+    instances come back detached and can be shared across sessions.
+    """
+    key = (channel_id, assistant_id)
+    cached = _channel_cache.get(key)
+    if cached and cached[2] > time.monotonic():
+        return cached[0], cached[1]
+
+    lock = _channel_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _channel_cache.get(key)
+            if cached and cached[2] > time.monotonic():
+                return cached[0], cached[1]
+
+            channel, assistant = await asyncio.gather(
+                _load_channel(channel_id),
+                _load_assistant(assistant_id)
+            )
+            if not channel or not assistant:
+                return channel, assistant
+
+            _channel_cache[key] = (channel, assistant, time.monotonic() + CHANNEL_CACHE_TTL)
+            if len(_channel_cache) > CHANNEL_CACHE_SIZE:
+                del _channel_cache[next(iter(_channel_cache))]
+            return channel, assistant
+    finally:
+        # Drop the lock once it is free so keys don't accumulate
+        if not lock.locked() and _channel_locks.get(key) is lock:
+            del _channel_locks[key]
+
 async def execute_scheduled_task(task_id: uuid.UUID):
     """
     Executor for Scheduled Tasks (Cron Jobs).
@@ -74,27 +161,42 @@ async def execute_scheduled_task(task_id: uuid.UUID):
     async with async_session_maker() as session:
         execution_record = None
         try:
-            # 1. Load Task & Dependencies
-            task = await session.get(ScheduledTask, task_id)
-            if not task or not task.is_active:
+            # 1. Claim & Load Task, then Dependencies
+            # Stamping last_run_at in the statement that loads the task makes
+            # the claim atomic: a second scheduler firing the same task within
+            # RUN_CLAIM_GUARD gets no row back and skips it
+            run_started_at = datetime.now(timezone.utc)
+            stmt = update(ScheduledTask).where(
+                ScheduledTask.id == task_id,
+                ScheduledTask.is_active == True,
+                or_(
+                    ScheduledTask.last_run_at.is_(None),
+                    ScheduledTask.last_run_at < run_started_at - RUN_CLAIM_GUARD
+                )
+            ).values(last_run_at=run_started_at)
+            if session.get_bind().dialect.update_returning:
+                task = (await session.execute(stmt.returning(ScheduledTask))).scalar_one_or_none()
+            else:
+                # MySQL has no UPDATE ... RETURNING: claim first, then load
+                result = await session.execute(stmt)
+                task = None
+                if result.rowcount == 1:
+                    task = (await session.execute(
+                        select(ScheduledTask).where(ScheduledTask.id == task_id)
+                    )).scalar_one_or_none()
+            if not task:
                 logger.warning(f"Task {task_id} skipped")
                 return
-                
-            task.last_run_at = datetime.utcnow()
+            # Release the row lock now rather than holding it for the whole run
+            await session.commit()
             
-            # Load Channel directly
-            channel = await session.get(ChannelConfig, task.channel_config_id)
+            channel, assistant = await _load_channel_and_assistant(
+                task.channel_config_id, task.assistant_id
+            )
             if not channel or not channel.is_active:
                 logger.error(f"Task {task_id} failed: Channel {task.channel_config_id} unavailable")
                 return
 
-            stmt = select(Assistant).options(
-                selectinload(Assistant.model).selectinload(Model.provider),
-                selectinload(Assistant.mcp_servers)
-            ).where(Assistant.id == task.assistant_id)
-            result = await session.execute(stmt)
-            assistant = result.scalar_one_or_none()
-
             if not assistant:
                  logger.error(f"Task {task_id} failed: Assistant unavailable")
                  return
@@ -103,20 +205,29 @@ async def execute_scheduled_task(task_id: uuid.UUID):
             execution_record = ScheduledTaskExecution(
                 task_id=task.id,
                 status="RUNNING",
-                started_at=datetime.utcnow()
+                started_at=run_started_at
             )
             session.add(execution_record)
+            # Commit the started run before streaming so the write lock isn't
+            # held for the whole LLM call and a crash mid-run leaves a record
             await session.commit()
-            await session.refresh(execution_record)
 
             # 2. Execution Engine
+            # Imported here: the engine pulls in the agent/LLM stack, which
+            # processes that only schedule tasks never need
+            from src.chat.engine import AIEngine
+
             ai_engine = AIEngine(session)
             service = ChannelServiceFactory.get_service(channel)
             
-            # We need to capture the full response for the log
-            full_response = []
+            # Capture a bounded preview, the length and a hash of the response for the log
+            preview = []
+            preview_chars = 0
+            total_chars = 0
+            result_hash = hashlib.blake2b(digest_size=16)
             
             async def _capture_and_yield():
+                nonlocal preview_chars, total_chars
                 async for chunk in _ai_engine_stream_adapter(
                     ai_engine, 
                     assistant, 
@@ -126,21 +237,29 @@ async def execute_scheduled_task(task_id: uuid.UUID):
                     # Using task_id allows *some* continuity if we ever implement task memory.
                     user_id=task.owner_id
                 ):
-                    full_response.append(chunk)
+                    result_hash.update(chunk.encode())
+                    total_chars += len(chunk)
+                    if preview_chars < RESULT_PREVIEW_CHARS:
+                        part = chunk[:RESULT_PREVIEW_CHARS - preview_chars]
+                        preview.append(part)
+                        preview_chars += len(part)
                     yield chunk
 
             # 3. Stream & Send
-            start_time = datetime.utcnow()
-            await service.send_stream(task.target_identifier, _capture_and_yield())
+            start_ns = time.perf_counter_ns()
+            await service.send_stream(task.target_identifier, coalesce_stream(_capture_and_yield()))
             
             # 4. Finalize Record
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            # Wall-clock timestamps are for storage; the duration uses a
+            # monotonic timer so clock adjustments don't skew it
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             
             execution_record.status = "COMPLETED"
-            execution_record.completed_at = end_time
-            execution_record.duration = f"{duration:.2f}s"
-            execution_record.result_summary = "".join(full_response)
+            execution_record.completed_at = datetime.now(timezone.utc)
+            execution_record.duration = round(duration, 3)
+            execution_record.result_summary = "".join(preview)
+            execution_record.result_length = total_chars
+            execution_record.result_hash = result_hash.hexdigest()
             
             # Deactivate if it was a one-time task
             if task.cron_expression.startswith("ONCE:"):
@@ -148,27 +267,112 @@ async def execute_scheduled_task(task_id: uuid.UUID):
                 logger.info(f"One-time task {task_id} completed and deactivated.")
 
             await session.commit()
-            logger.info(f"Task {task_id} completed. Duration: {duration}s")
+            logger.info(f"Task {task_id} completed. Duration: {duration:.3f}s")
             
         except Exception as e:
             logger.exception(f"Scheduled Task {task_id} failed: {e}")
             if execution_record:
                 execution_record.status = "FAILED"
-                execution_record.error_message = str(e)
-                execution_record.completed_at = datetime.utcnow()
+                execution_record.error_message = str(e)[:ERROR_MESSAGE_MAX_CHARS]
+                execution_record.completed_at = datetime.now(timezone.utc)
                 await session.commit()
 
-async def process_incoming_message(
+async def _handle_incoming_message(
     channel_id: uuid.UUID, 
     user_id: str, 
     text: str, 
-    stream_id: Optional[str] = None
+    stream_id: Optional[str] = None,
+    message_id: Optional[str] = None
 ):
     """
     Process incoming message from a channel (webhook).
-    This mimics what execute_scheduled_task does but triggered by an event.
+    This mimics what execute_scheduled_task does but triggered by an event:
+    streamed replies go to the stream buffer the adapter polls, the rest
+    are sent back through the channel adapter once complete.
+    """
+    logger.info(f"Processing incoming message for channel {channel_id} user {user_id}")
+    from src.channels.adapters.base import IncomingMessage
+    from src.channels.service import ChannelService
+
+    async with async_session_maker() as session:
+        service = ChannelService(session)
+        channel = await service.get_channel(channel_id)
+        if not channel or not channel.is_active:
+            logger.warning(f"Dropping message for inactive or missing channel {channel_id}")
+            return
+
+        incoming = IncomingMessage(
+            user_id=user_id,
+            content=text,
+            message_id=message_id or "",
+            channel_id=str(channel_id),
+            stream_id=stream_id,
+        )
+        if stream_id:
+            await service.process_stream_generation_logic(channel, incoming, stream_id)
+        else:
+            adapter = await service.get_adapter(channel)
+            await service._process_incoming_message(channel, adapter, incoming)
+
+async def _incoming_message_worker(queue: "asyncio.Queue[Dict[str, Any]]"):
+    while True:
+        message = await queue.get()
+        try:
+            await _handle_incoming_message(**message)
+        except Exception as e:
+            logger.exception(f"Failed to process incoming message for channel {message['channel_id']}: {e}")
+        finally:
+            queue.task_done()
+
+def start_incoming_message_workers():
+    """Start the worker pool draining incoming webhook messages"""
+    if _incoming_workers:
+        return
+    for _ in range(INCOMING_MESSAGE_WORKERS):
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=INCOMING_MESSAGE_QUEUE_SIZE)
+        _incoming_queues.append(queue)
+        _incoming_workers.append(asyncio.create_task(_incoming_message_worker(queue)))
+
+async def stop_incoming_message_workers():
+    """Cancel the worker pool; messages still queued are dropped"""
+    for worker in _incoming_workers:
+        worker.cancel()
+    await asyncio.gather(*_incoming_workers, return_exceptions=True)
+    _incoming_workers.clear()
+    _incoming_queues.clear()
+
+async def process_incoming_message(
+    channel_id: uuid.UUID, 
+    user_id: str, 
+    text: str, 
+    stream_id: Optional[str] = None,
+    message_id: Optional[str] = None
+):
+    """
+    Queue an incoming channel message for the worker pool. Messages from one
+    user of a channel always land on the same worker, so each conversation
+    is handled in order while different users are spread across workers;
+    waits while that worker's queue is full. A message the provider
+    redelivers with the same message_id from the same user is dropped;
+    messages without a message_id are never deduplicated.
     """
-    logging.info(f"Processing incoming message for channel {channel_id} user {user_id}")
-    # Implementation depends on logic...
-    pass
+    if message_id:
+        now = time.monotonic()
+        key = (channel_id, user_id, message_id)
+        seen_until = _recent_message_ids.get(key)
+        if seen_until and seen_until > now:
+            logger.info(f"Dropping redelivered message {message_id} for channel {channel_id}")
+            return
+        _recent_message_ids[key] = now + INCOMING_MESSAGE_DEDUP_TTL
+        if len(_recent_message_ids) > INCOMING_MESSAGE_DEDUP_SIZE:
+            del _recent_message_ids[next(iter(_recent_message_ids))]
 
+    start_incoming_message_workers()
+    queue = _incoming_queues[hash((channel_id, user_id)) % len(_incoming_queues)]
+    await queue.put({
+        "channel_id": channel_id,
+        "user_id": user_id,
+        "text": text,
+        "stream_id": stream_id,
+        "message_id": message_id,
+    })
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Boolean, Text, ForeignKey, DateTime
+from sqlalchemy import String, Boolean, Text, Integer, Float, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from fastapi_users_db_sqlalchemy.generics import GUID
 
@@ -37,6 +37,11 @@ class ScheduledTask(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Scheduler sync scans active tasks; partial on PostgreSQL so paused tasks aren't indexed
+        Index("ix_scheduled_tasks_active", "is_active", "owner_id", postgresql_where=text("is_active")),
+    )
+
 
 class ScheduledTaskExecution(Base):
     """
@@ -44,18 +49,24 @@ class ScheduledTaskExecution(Base):
     """
     __tablename__ = "scheduled_task_executions"
 
-    task_id: Mapped[uuid.UUID] = mapped_column(GUID, ForeignKey("scheduled_tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    task_id: Mapped[uuid.UUID] = mapped_column(GUID, ForeignKey("scheduled_tasks.id", ondelete="CASCADE"), nullable=False)
     
     status: Mapped[str] = mapped_column(String(50), default="PENDING") # PENDING, RUNNING, COMPLETED, FAILED
     
-    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
-    duration: Mapped[Optional[float]] = mapped_column(String(50), nullable=True) # Stored as float seconds or string "1.2s"
+    duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Seconds
     
-    # We store the final text result here. 
-    # If the response is huge, consider truncation or separate storage.
+    # Preview of the final text result (first RESULT_PREVIEW_CHARS chars),
+    # with the full length and a hash of the complete response
     result_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result_length: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    result_hash: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    __table_args__ = (
+        # Serves "latest executions of a task"; also covers lookups by task_id alone
+        Index("ix_scheduled_task_executions_task_started", "task_id", "started_at"),
+    )
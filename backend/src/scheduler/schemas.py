@@ -1,6 +1,32 @@
-from pydantic import BaseModel, UUID4, Field, ConfigDict
+from pydantic import BaseModel, UUID4, Field, ConfigDict, field_validator
 from typing import Optional
 from datetime import datetime
+from zoneinfo import ZoneInfo
+from apscheduler.triggers.cron import CronTrigger
+
+
+def validate_cron_expression(v: str) -> str:
+    """Accept a 5-field crontab expression or ONCE:<ISO datetime>"""
+    if v.startswith("ONCE:"):
+        try:
+            datetime.fromisoformat(v.replace("ONCE:", ""))
+        except ValueError:
+            raise ValueError("ONCE: must be followed by an ISO datetime (YYYY-MM-DDTHH:MM:SS)")
+    else:
+        try:
+            CronTrigger.from_crontab(v, timezone="UTC")
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression: {e}")
+    return v
+
+
+def validate_timezone(v: str) -> str:
+    try:
+        ZoneInfo(v)
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown timezone: {v}")
+    return v
+
 
 class ScheduledTaskBase(BaseModel):
     name: str = Field(..., max_length=100)
@@ -14,7 +40,17 @@ class ScheduledTaskBase(BaseModel):
     is_active: bool = True
 
 class ScheduledTaskCreate(ScheduledTaskBase):
-    pass
+    # Validated here rather than in ScheduledTaskBase so reading existing
+    # rows never fails; the scheduler would otherwise skip the task silently
+    @field_validator("cron_expression")
+    @classmethod
+    def check_cron_expression(cls, v: str) -> str:
+        return validate_cron_expression(v)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, v: str) -> str:
+        return validate_timezone(v)
 
 class ScheduledTaskUpdate(BaseModel):
     name: Optional[str] = None
@@ -27,11 +63,21 @@ class ScheduledTaskUpdate(BaseModel):
     target_identifier: Optional[str] = None
     is_active: Optional[bool] = None
 
+    @field_validator("cron_expression")
+    @classmethod
+    def check_cron_expression(cls, v: Optional[str]) -> Optional[str]:
+        return v if v is None else validate_cron_expression(v)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, v: Optional[str]) -> Optional[str]:
+        return v if v is None else validate_timezone(v)
+
 class ScheduledTaskRead(ScheduledTaskBase):
     id: UUID4
     owner_id: UUID4
     last_run_at: Optional[datetime] = None
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class ScheduledTaskExecutionRead(BaseModel):
     id: UUID4
@@ -39,8 +85,10 @@ class ScheduledTaskExecutionRead(BaseModel):
     status: str
     started_at: datetime
     completed_at: Optional[datetime] = None
-    duration: Optional[str] = None
+    duration: Optional[float] = None
     result_summary: Optional[str] = None
+    result_length: Optional[int] = None
+    result_hash: Optional[str] = None
     error_message: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
@@ -1,9 +1,24 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Type, TypeVar
-import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
+import orjson
 
 T = TypeVar("T")
 
+# Per-type validators and serializers, resolved once instead of on every cache hit
+_validate_cache: Dict[type, Callable[[Any], Any]] = {}
+_dump_cache: Dict[type, Optional[Callable[[Any], str]]] = {}
+
+
+def _get_dumper(cls: type) -> Optional[Callable[[Any], str]]:
+    try:
+        return _dump_cache[cls]
+    except KeyError:
+        # Pydantic v2, then v1; None falls back to a plain JSON dump
+        dump = getattr(cls, "model_dump_json", None) or getattr(cls, "json", None)
+        _dump_cache[cls] = dump
+        return dump
+
 class CacheBackend(ABC):
     @abstractmethod
     async def get(self, key: str) -> Optional[Any]: 
@@ -25,6 +40,60 @@ class CacheBackend(ABC):
         """Check if a key exists."""
         ...
     
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values at once, in the order of keys."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, Any], expire: int = 60) -> None:
+        """Set several values sharing the same expiration time in seconds."""
+        for key, value in items.items():
+            await self.set(key, value, expire=expire)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire: int = 60,
+    ) -> Any:
+        """
+        Get a value, filling it with loader() on a miss.
+        Concurrent misses for the same key in this process share one loader call.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        inflight: Dict[str, asyncio.Future] = self.__dict__.setdefault("_inflight", {})
+        future = inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The filling coroutine was cancelled, not us; try to fill it ourselves
+                return await self.get_or_set(key, loader, expire=expire)
+
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            value = await loader()
+            if value is not None:
+                await self.set(key, value, expire=expire)
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark as retrieved so a fill nobody waited on doesn't log a warning
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del inflight[key]
+
+        future.set_result(value)
+        return value
+
     # Advanced features: Support direct Pydantic model storage
     async def get_model(self, key: str, model: Type[T]) -> Optional[T]:
         """
@@ -35,15 +104,19 @@ class CacheBackend(ABC):
         if data is None:
             return None
         
-        if isinstance(data, str):
+        if isinstance(data, (str, bytes)):
             try:
                 # Try to load as JSON if it's a string
-                data = json.loads(data)
-            except json.JSONDecodeError:
+                data = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 return None
                 
         if isinstance(data, dict):
-            return model.model_validate(data)
+            validator = _validate_cache.get(model)
+            if validator is None:
+                validator = model.model_validate
+                _validate_cache[model] = validator
+            return validator(data)
             
         return None
 
@@ -51,14 +124,11 @@ class CacheBackend(ABC):
         """
         Set a Pydantic model to cache.
         """
-        if hasattr(value, "model_dump_json"):
-            # Pydantic v2
-            json_str = value.model_dump_json()
-        elif hasattr(value, "json"):
-            # Pydantic v1
-            json_str = value.json()
+        dump = _get_dumper(type(value))
+        if dump is not None:
+            json_str = dump(value)
         else:
-            # Fallback to json dump
-            json_str = json.dumps(value)
+            # Fallback to json dump; decoded so every driver stores the same str type
+            json_str = orjson.dumps(value).decode()
             
         await self.set(key, json_str, expire=expire)
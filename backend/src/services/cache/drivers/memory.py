@@ -1,46 +1,92 @@
 import time
-from typing import Any, Optional, Dict, Tuple
+from itertools import islice
+from typing import Any, Dict, List, Optional
 from ..abstraction import CacheBackend
 
+# Default cap on cached keys; the least frequently/recently used key is evicted beyond it
+DEFAULT_MAX_ENTRIES = 10000
+
+# Access counters saturate here
+MAX_ACCESS_COUNT = 255
+
+# New keys start with a few hits' credit so they aren't the next victim
+INITIAL_ACCESS_COUNT = 5
+
+# Eviction only compares this many keys from the front of the store
+EVICTION_SAMPLE_SIZE = 5
+
 class MemoryDriver(CacheBackend):
-    def __init__(self, prefix: str = ""):
-        # Store as key -> (value, expiry_timestamp)
-        self._store: Dict[str, Tuple[Any, float]] = {}
+    def __init__(self, prefix: str = "", max_entries: int = DEFAULT_MAX_ENTRIES):
+        # Store as key -> [value, monotonic_expiry, access_count]. Reads only bump
+        # the count in place, so hot keys don't reorder the dict on every hit
+        self._store: Dict[str, List[Any]] = {}
         self._prefix = prefix
+        self._max_entries = max_entries
 
     def _make_key(self, key: str) -> str:
         return f"{self._prefix}{key}"
 
+    def _touch(self, entry: List[Any]) -> None:
+        if entry[2] < MAX_ACCESS_COUNT:
+            entry[2] += 1
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        sample = list(islice(self._store.items(), EVICTION_SAMPLE_SIZE))
+        expired = [key for key, entry in sample if now > entry[1]]
+        if expired:
+            for key in expired:
+                del self._store[key]
+            return
+
+        victim = min(sample, key=lambda item: item[1][2])[0]
+        del self._store[victim]
+        # Survivors move to the back with their count halved, so the sample
+        # walks the whole store over time and old hits decay
+        for key, entry in sample:
+            if key != victim:
+                entry[2] >>= 1
+                self._store[key] = self._store.pop(key)
+
     async def get(self, key: str) -> Optional[Any]:
         full_key = self._make_key(key)
-        if full_key not in self._store:
+        entry = self._store.get(full_key)
+        if entry is None:
             return None
-        
-        value, expiry = self._store[full_key]
-        if time.time() > expiry:
-            del self._store[full_key]
+
+        if time.monotonic() > entry[1]:
+            self._store.pop(full_key, None)
             return None
-            
-        return value
+
+        self._touch(entry)
+        return entry[0]
 
     async def set(self, key: str, value: Any, expire: int = 60) -> None:
         full_key = self._make_key(key)
-        expiry = time.time() + expire
-        self._store[full_key] = (value, expiry)
+        expiry = time.monotonic() + expire
+        entry = self._store.get(full_key)
+        if entry is not None:
+            entry[0] = value
+            entry[1] = expiry
+            self._touch(entry)
+            return
+
+        if len(self._store) >= self._max_entries:
+            self._evict()
+        self._store[full_key] = [value, expiry, INITIAL_ACCESS_COUNT]
 
     async def delete(self, key: str) -> None:
-        full_key = self._make_key(key)
-        if full_key in self._store:
-            del self._store[full_key]
+        self._store.pop(self._make_key(key), None)
 
     async def exists(self, key: str) -> bool:
         full_key = self._make_key(key)
-        if full_key not in self._store:
+        entry = self._store.get(full_key)
+        if entry is None:
             return False
-            
-        _, expiry = self._store[key]
-        if time.time() > expiry:
-            del self._store[key]
+
+        if time.monotonic() > entry[1]:
+            self._store.pop(full_key, None)
             return False
-            
+
+        self._touch(entry)
         return True
@@ -1,26 +1,51 @@
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 import redis.asyncio as redis
 from ..abstraction import CacheBackend
 
+# Connections kept per process; callers wait up to REDIS_POOL_TIMEOUT seconds for
+# a free one under bursts instead of opening new TCP connections
+REDIS_MAX_CONNECTIONS = 50
+REDIS_POOL_TIMEOUT = 5
+
 class RedisDriver(CacheBackend):
     def __init__(self, redis_url: str, prefix: str = ""):
-        self._redis = redis.from_url(redis_url, decode_responses=True)
+        # redis-py parses replies with hiredis automatically when it is installed
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+        )
+        self._redis = redis.Redis(connection_pool=pool)
+        # Keys are prefixed with a plain concatenation inline instead of a
+        # helper call and f-string per operation
         self._prefix = prefix
 
-    def _make_key(self, key: str) -> str:
-        return f"{self._prefix}{key}"
-
     async def get(self, key: str) -> Optional[Any]:
-        return await self._redis.get(self._make_key(key))
+        return await self._redis.get(self._prefix + key)
     
     async def set(self, key: str, value: Any, expire: int = 60) -> None:
         # Convert value to string if necessary, though redis-py handles some types.
         # But for consistency with our abstraction, we expect primitives or strings here.
         # Complex objects should be handled via set_model or serialized before calling set.
-        await self._redis.set(self._make_key(key), value, ex=expire)
+        await self._redis.set(self._prefix + key, value, ex=expire)
     
     async def delete(self, key: str) -> None:
-        await self._redis.delete(self._make_key(key))
+        await self._redis.delete(self._prefix + key)
     
     async def exists(self, key: str) -> bool:
-        return await self._redis.exists(self._make_key(key)) > 0
+        return await self._redis.exists(self._prefix + key) > 0
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        return await self._redis.mget([self._prefix + key for key in keys])
+
+    async def set_many(self, items: Dict[str, Any], expire: int = 60) -> None:
+        if not items:
+            return
+        # MSET has no expiry, so pipeline the SET EX calls into one round-trip
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(self._prefix + key, value, ex=expire)
+            await pipe.execute()
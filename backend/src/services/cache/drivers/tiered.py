@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional
+from ..abstraction import CacheBackend
+from .memory import MemoryDriver
+
+# Seconds a value read from L2 is served from the in-process L1; this bounds how
+# long a change made by another process can go unnoticed here
+L1_TTL = 5
+L1_MAX_ENTRIES = 1024
+
+class TieredCache(CacheBackend):
+    """In-process MemoryDriver (L1) in front of a shared backend (L2)"""
+
+    def __init__(self, l1: MemoryDriver, l2: CacheBackend, l1_ttl: int = L1_TTL):
+        self._l1 = l1
+        self._l2 = l2
+        self._l1_ttl = l1_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._l1.get(key)
+        if value is not None:
+            return value
+
+        value = await self._l2.get(key)
+        if value is not None:
+            await self._l1.set(key, value, expire=self._l1_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        await self._l2.set(key, value, expire=expire)
+        await self._l1.set(key, value, expire=min(self._l1_ttl, expire))
+
+    async def delete(self, key: str) -> None:
+        await self._l1.delete(key)
+        await self._l2.delete(key)
+
+    async def exists(self, key: str) -> bool:
+        # Existence checks are used for cross-process signals (e.g. stop_signal),
+        # so they always consult L2 rather than a possibly stale L1 copy
+        return await self._l2.exists(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        values = await self._l1.get_many(keys)
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if not missing:
+            return values
+
+        fetched = dict(zip(missing, await self._l2.get_many(missing)))
+        found = {key: value for key, value in fetched.items() if value is not None}
+        if found:
+            await self._l1.set_many(found, expire=self._l1_ttl)
+        return [value if value is not None else fetched[key] for key, value in zip(keys, values)]
+
+    async def set_many(self, items: Dict[str, Any], expire: int = 60) -> None:
+        await self._l2.set_many(items, expire=expire)
+        await self._l1.set_many(items, expire=min(self._l1_ttl, expire))
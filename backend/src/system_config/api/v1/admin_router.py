@@ -1,6 +1,7 @@
-from typing import Dict
+from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
 
 from src.database import get_async_session
 from ...service import config_service
@@ -15,6 +16,9 @@ from .schemas import (
 
 router = APIRouter()
 
+# Validates a whole list of config rows in one pydantic-core call
+_config_list_adapter = TypeAdapter(List[ConfigResponse])
+
 # Admin configuration endpoints (requires superuser permissions)
 @router.get("/config", response_model=ConfigListResponse, tags=["Configuration Management"])
 async def get_all_configs(
@@ -24,7 +28,7 @@ async def get_all_configs(
     Get all configuration items (admin only)
     """
     configs = await config_service.get_all_configs(session)
-    config_responses = [ConfigResponse.model_validate(config) for config in configs]
+    config_responses = _config_list_adapter.validate_python(configs, from_attributes=True)
     return ConfigListResponse(configs=config_responses, total=len(config_responses))
 
 
@@ -107,7 +111,7 @@ async def batch_update_configs(
     Batch update configuration items (admin only)
     """
     configs = await config_service.batch_update_configs(session, batch_data.configs)
-    config_responses = [ConfigResponse.model_validate(config) for config in configs]
+    config_responses = _config_list_adapter.validate_python(configs, from_attributes=True)
     return ConfigListResponse(configs=config_responses, total=len(config_responses))
 
 
@@ -119,5 +123,5 @@ async def clear_config_cache(
     
     When configurations have issues, you can manually clear cache to force reload.
     """
-    config_service.clear_cache()
+    await config_service.clear_cache()
     return {"message": "Configuration cache has been cleared"}
\ No newline at end of file
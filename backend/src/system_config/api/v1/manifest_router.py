@@ -1,24 +1,23 @@
-from fastapi import APIRouter, Depends, Response, status
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from typing import Any, Mapping
 
 from src.database import get_async_session
 from src.system_config.service import config_service
 
 router = APIRouter()
 
-@router.get("/manifest.json")
-async def get_manifest(
-    session: AsyncSession = Depends(get_async_session)
-):
-    """
-    Generate dynamic PWA manifest based on system configuration.
-    """
-    configs = await config_service.get_public_configs(session)
-    
+# Browsers may reuse the manifest for this many seconds before revalidating
+MANIFEST_MAX_AGE = 300
+
+def _render_manifest(configs: Mapping[str, Any]) -> str:
+    """Render the manifest JSON, or an empty string when PWA is disabled"""
     # Check if PWA is enabled
     if not configs.get("pwa_enabled", True):
-        return Response(status_code=status.HTTP_404_NOT_FOUND)
+        return ""
     
     # Get values with defaults
     name = configs.get("site_title", "RiceBall")
@@ -74,5 +73,30 @@ async def get_manifest(
         "scope": "/",
         "icons": icons
     }
-    
-    return manifest
+
+    return orjson.dumps(manifest).decode()
+
+
+@router.get("/manifest.json")
+async def get_manifest(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Generate dynamic PWA manifest based on system configuration.
+    """
+    # Rendered once and cached until a public config changes; the ETag lets
+    # clients revalidate without downloading the manifest again
+    content = await config_service.get_public_manifest(session, _render_manifest)
+    if not content:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+    etag = f'"{hashlib.blake2b(content.encode(), digest_size=16).hexdigest()}"'
+    headers = {
+        "Cache-Control": f"public, max-age={MANIFEST_MAX_AGE}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=content, media_type="application/manifest+json", headers=headers)
@@ -1,6 +1,6 @@
 import uuid
 from typing import Any, Optional, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ConfigCreate(BaseModel):
@@ -42,18 +42,16 @@ class ConfigResponse(BaseModel):
     options: Optional[str]
     created_at: Any
     updated_at: Any
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class PublicConfigResponse(BaseModel):
     """Public configuration response model"""
     key: str
     value: Any
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ConfigListResponse(BaseModel):
@@ -61,11 +59,15 @@ class ConfigListResponse(BaseModel):
     configs: list[ConfigResponse]
     total: int
 
+    model_config = ConfigDict(frozen=True)
+
 
 class PublicConfigsResponse(BaseModel):
     """Public configurations collection response model"""
     configs: Dict[str, Any] = Field(..., description="Configuration key-value pairs")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class ConfigBatchUpdate(BaseModel):
     """Request model for batch updating configurations"""
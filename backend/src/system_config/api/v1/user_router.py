@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
@@ -10,12 +13,16 @@ from .schemas import (
 
 router = APIRouter()
 
+# Seconds browsers may reuse the public configs before revalidating
+PUBLIC_CONFIGS_MAX_AGE = 60
+
 
 # Public configuration endpoints (no authentication required)
 @router.get("/config/public", response_model=PublicConfigsResponse)
 async def get_public_configs(
+    request: Request,
     session: AsyncSession = Depends(get_async_session)
-) -> PublicConfigsResponse:
+):
     """
     Get all public configurations
     
@@ -23,4 +30,14 @@ async def get_public_configs(
     such as whether registration is enabled, etc.
     """
     configs = await config_service.get_public_configs(session)
-    return PublicConfigsResponse(configs=configs)
\ No newline at end of file
+    content = orjson.dumps({"configs": dict(configs)})
+
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    headers = {
+        "Cache-Control": f"public, max-age={PUBLIC_CONFIGS_MAX_AGE}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=content, media_type="application/json", headers=headers)
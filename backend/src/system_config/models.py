@@ -1,4 +1,4 @@
-import json
+import orjson
 from typing import Any, Optional
 from sqlalchemy import String, Text, Boolean
 from sqlalchemy.orm import Mapped, mapped_column
@@ -6,6 +6,14 @@ from sqlalchemy.orm import Mapped, mapped_column
 from ..models import Base
 
 
+def parse_config_value(raw: str) -> Any:
+    """Parse a stored configuration value, falling back to the raw string"""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return raw
+
+
 class SystemConfig(Base):
     """System configuration table"""
     
@@ -81,18 +89,23 @@ class SystemConfig(Base):
     
     def get_value(self) -> Any:
         """Get parsed configuration value"""
-        try:
-            return json.loads(self.value)
-        except json.JSONDecodeError:
-            # If cannot parse as JSON, return original string
-            return self.value
+        # Parsed once per raw value; the raw string is compared by identity so
+        # set_value or a refresh from the database invalidates it
+        raw = self.value
+        cached = self.__dict__.get("_parsed_value")
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        parsed = parse_config_value(raw)
+        self.__dict__["_parsed_value"] = (raw, parsed)
+        return parsed
     
     def set_value(self, value: Any) -> None:
         """Set configuration value, automatically convert to JSON format"""
         if isinstance(value, str):
             self.value = value
         else:
-            self.value = json.dumps(value, ensure_ascii=False)
+            self.value = orjson.dumps(value).decode()
     
     def __repr__(self) -> str:
         return f"<SystemConfig(key='{self.key}', value='{self.value}', is_public={self.is_public})>"
\ No newline at end of file
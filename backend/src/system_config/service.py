@@ -1,14 +1,29 @@
-import json
-import uuid
-from typing import Any, Dict, List, Optional
+import asyncio
+import re
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.services.cache import get_cache_service
-from .models import SystemConfig
+from .models import SystemConfig, parse_config_value
 from .api.v1.schemas import ConfigCreate, ConfigUpdate
 
+# Seconds a value read through get_config_value is reused by this process;
+# writes through ConfigService clear it immediately
+CONFIG_VALUE_TTL = 60
+
+# Cached in place of a value for keys that are missing or disabled
+_MISSING = object()
+
+# Canonical hyphenated UUID, as stored for model IDs
+_UUID_PATTERN = re.compile(r"\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z", re.IGNORECASE)
+
 
 class ConfigService:
     """Configuration management service"""
@@ -16,6 +31,14 @@ class ConfigService:
     def __init__(self):
         self.cache = get_cache_service()
         self._public_config_key = "system_config:public"
+        self._manifest_key = "system_config:manifest"
+        # Last cached public-config JSON and its parsed, read-only form; reads
+        # that see the same JSON reuse the snapshot instead of parsing again
+        self._public_snapshot: Tuple[Optional[str], Mapping[str, Any]] = (None, MappingProxyType({}))
+        # key -> (parsed value or _MISSING, monotonic expiry)
+        self._config_values: Dict[str, Tuple[Any, float]] = {}
+        # Per-key locks held while a missing value is loaded, dropped once free
+        self._config_value_locks: Dict[str, asyncio.Lock] = {}
     
     async def get_config(self, session: AsyncSession, key: str) -> Optional[SystemConfig]:
         """Get single configuration item"""
@@ -29,8 +52,23 @@ class ConfigService:
     
     async def get_config_value(self, session: AsyncSession, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        config = await self.get_config(session, key)
-        return config.get_value() if config else default
+        entry = self._config_values.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            # Concurrent misses for the same key wait for the first lookup
+            # instead of repeating it; other keys are not held up
+            lock = self._config_value_locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    entry = self._config_values.get(key)
+                    if entry is None or entry[1] <= time.monotonic():
+                        config = await self.get_config(session, key)
+                        value = config.get_value() if config else _MISSING
+                        entry = (value, time.monotonic() + CONFIG_VALUE_TTL)
+                        self._config_values[key] = entry
+            finally:
+                if not lock.locked() and self._config_value_locks.get(key) is lock:
+                    del self._config_value_locks[key]
+        return default if entry[0] is _MISSING else entry[0]
     
     async def get_all_configs(self, session: AsyncSession) -> List[SystemConfig]:
         """Get all configuration items"""
@@ -39,37 +77,61 @@ class ConfigService:
         )
         return result.scalars().all()
     
-    async def get_public_configs(self, session: AsyncSession) -> Dict[str, Any]:
-        """Get all public configurations"""
-        # Try to get from cache first
+    async def get_public_configs(self, session: AsyncSession) -> Mapping[str, Any]:
+        """Get all public configurations (read-only)"""
+        async def load_public_configs() -> str:
+            # Only key and value are needed, so skip building full ORM rows
+            result = await session.execute(
+                select(SystemConfig.key, SystemConfig.value).where(
+                    SystemConfig.is_public,
+                    SystemConfig.is_enabled
+                )
+            )
+
+            # Build configuration dictionary
+            return orjson.dumps({key: parse_config_value(value) for key, value in result.all()}).decode()
+
+        # Concurrent misses share a single database load
         try:
-            cached_data = await self.cache.get(self._public_config_key)
-            if cached_data:
-                # Handle both string (Redis) and dict (Memory) return types
-                if isinstance(cached_data, str):
-                    return json.loads(cached_data)
-                return cached_data
+            cached_data = await self.cache.get_or_set(
+                self._public_config_key, load_public_configs, expire=300
+            )
+        except SQLAlchemyError:
+            raise
         except Exception:
             # If cache fails, fallback to DB
-            pass
-        
-        # Get from database
-        result = await session.execute(
-            select(SystemConfig).where(
-                SystemConfig.is_public,
-                SystemConfig.is_enabled
-            )
-        )
-        configs = result.scalars().all()
-        
-        # Build configuration dictionary
-        config_dict = {config.key: config.get_value() for config in configs}
-        
-        # Update cache
-        await self.cache.set(self._public_config_key, json.dumps(config_dict), expire=300)
-        
-        return config_dict
+            cached_data = await load_public_configs()
+
+        # Handle both string (Redis) and dict (Memory) return types
+        if isinstance(cached_data, str):
+            raw, snapshot = self._public_snapshot
+            if raw != cached_data:
+                snapshot = MappingProxyType(orjson.loads(cached_data))
+                self._public_snapshot = (cached_data, snapshot)
+            return snapshot
+        return MappingProxyType(cached_data)
     
+    async def get_public_manifest(
+        self, session: AsyncSession, render: Callable[[Mapping[str, Any]], str]
+    ) -> str:
+        """Get the PWA manifest rendered from the public configurations"""
+        async def load_manifest() -> str:
+            return render(await self.get_public_configs(session))
+
+        # Cached until any public config changes, so a hit skips the config
+        # lookup and serialization entirely
+        try:
+            return await self.cache.get_or_set(self._manifest_key, load_manifest, expire=3600)
+        except SQLAlchemyError:
+            raise
+        except Exception:
+            return await load_manifest()
+
+    async def _invalidate_public_configs(self) -> None:
+        self._config_values.clear()
+        await self.cache.delete(self._public_config_key)
+        await self.cache.delete(self._manifest_key)
+
     async def create_config(self, session: AsyncSession, config_data: ConfigCreate) -> SystemConfig:
         """Create configuration item"""
         try:
@@ -85,13 +147,35 @@ class ConfigService:
             )
             config.set_value(config_data.value)
             
-            session.add(config)
-            await session.commit()
-            await session.refresh(config)
+            if session.get_bind().dialect.insert_returning:
+                # Get the generated id and timestamps back from the INSERT
+                # itself instead of refreshing the row afterwards
+                result = await session.execute(
+                    insert(SystemConfig)
+                    .values(
+                        key=config.key,
+                        value=config.value,
+                        description=config.description,
+                        is_public=config.is_public,
+                        is_enabled=config.is_enabled,
+                        config_type=config.config_type,
+                        config_group=config.config_group,
+                        label=config.label,
+                        options=config.options
+                    )
+                    .returning(SystemConfig)
+                )
+                config = result.scalar_one()
+                await session.commit()
+            else:
+                session.add(config)
+                await session.commit()
+                await session.refresh(config)
             
+            self._config_values.pop(config.key, None)
             # Clear public config cache to force reload if this is a public config
             if config.is_public:
-                await self.cache.delete(self._public_config_key)
+                await self._invalidate_public_configs()
             
             return config
             
@@ -101,18 +185,13 @@ class ConfigService:
     
     async def update_config(self, session: AsyncSession, key: str, config_data: ConfigUpdate) -> Optional[SystemConfig]:
         """Update configuration item"""
-        # First get existing configuration
-        config = await self.get_config(session, key)
-        if not config:
-            return None
-        
         # Update fields
         update_data = {}
         if config_data.value is not None:
             if isinstance(config_data.value, str):
                 update_data["value"] = config_data.value
             else:
-                update_data["value"] = json.dumps(config_data.value, ensure_ascii=False)
+                update_data["value"] = orjson.dumps(config_data.value).decode()
         
         if config_data.description is not None:
             update_data["description"] = config_data.description
@@ -135,19 +214,37 @@ class ConfigService:
         if config_data.options is not None:
             update_data["options"] = config_data.options
         
-        if update_data:
-            await session.execute(
-                update(SystemConfig)
-                .where(SystemConfig.key == key)
-                .values(**update_data)
+        if not update_data:
+            return await self.get_config(session, key)
+        
+        stmt = (
+            update(SystemConfig)
+            .where(SystemConfig.key == key, SystemConfig.is_enabled)
+            .values(**update_data)
+        )
+        if session.get_bind().dialect.update_returning:
+            # Check, update and re-read the row in a single statement
+            result = await session.execute(
+                stmt.returning(SystemConfig),
+                execution_options={"populate_existing": True}
             )
+            config = result.scalar_one_or_none()
+            if not config:
+                return None
+            await session.commit()
+        else:
+            # First get existing configuration
+            config = await self.get_config(session, key)
+            if not config:
+                return None
+            await session.execute(stmt)
             await session.commit()
             
             # Re-fetch updated configuration
             await session.refresh(config)
-            
-            # Clear public config cache to force reload
-            await self.cache.delete(self._public_config_key)
+        
+        # Clear public config cache to force reload
+        await self._invalidate_public_configs()
         
         return config
     
@@ -160,26 +257,48 @@ class ConfigService:
         if result.rowcount > 0:
             await session.commit()
             # Clear public config cache to force reload
-            await self.cache.delete(self._public_config_key)
+            await self._invalidate_public_configs()
             return True
         
         return False
     
     async def batch_update_configs(self, session: AsyncSession, configs: Dict[str, Any]) -> List[SystemConfig]:
         """Batch update configuration items"""
-        updated_configs = []
-        
-        for key, value in configs.items():
-            config_data = ConfigUpdate(value=value)
-            updated_config = await self.update_config(session, key, config_data)
-            if updated_config:
-                updated_configs.append(updated_config)
-        
-        return updated_configs
+        # Same rules as update_config: only enabled items are updated and a
+        # None value leaves the stored value unchanged
+        result = await session.execute(
+            select(SystemConfig).where(
+                SystemConfig.key.in_(configs.keys()),
+                SystemConfig.is_enabled
+            )
+        )
+        existing = {config.key: config for config in result.scalars().all()}
+
+        changed = False
+        for key, config in existing.items():
+            if configs[key] is not None:
+                config.set_value(configs[key])
+                changed = True
+
+        if changed:
+            # The unit of work sends the UPDATEs as one executemany
+            await session.commit()
+
+            # Reload once for the server-side updated_at
+            result = await session.execute(
+                select(SystemConfig)
+                .where(SystemConfig.key.in_(existing.keys()))
+                .execution_options(populate_existing=True)
+            )
+            existing = {config.key: config for config in result.scalars().all()}
+
+            await self._invalidate_public_configs()
+
+        return [existing[key] for key in configs if key in existing]
     
     async def clear_cache(self) -> None:
         """Clear cache"""
-        await self.cache.delete(self._public_config_key)
+        await self._invalidate_public_configs()
     
     # Dedicated method for title generation model configuration
     async def get_title_generation_model_id(self, session: AsyncSession) -> Optional[str]:
@@ -189,22 +308,45 @@ class ConfigService:
     async def set_title_generation_model_id(self, session: AsyncSession, model_id: str) -> SystemConfig:
         """Set title generation model ID"""
         # Validate if it is a valid UUID format
-        try:
-            uuid.UUID(model_id)
-        except ValueError:
+        if not _UUID_PATTERN.match(model_id):
             raise ValueError("Invalid model ID format")
         
+        key = "conversation_title_model_id"
+        dialect = session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            # Create or update the configuration in a single statement
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(SystemConfig).values(
+                key=key,
+                value=model_id,
+                description="Model ID used for generating conversation titles",
+                is_public=False,
+                is_enabled=True
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SystemConfig.key],
+                set_={"value": stmt.excluded.value, "updated_at": func.now()}
+            ).returning(SystemConfig)
+            result = await session.execute(stmt, execution_options={"populate_existing": True})
+            config = result.scalar_one()
+            await session.commit()
+            
+            self._config_values.pop(key, None)
+            if config.is_public:
+                await self._invalidate_public_configs()
+            return config
+        
         # Check if configuration already exists
-        existing_config = await self.get_config(session, "conversation_title_model_id")
+        existing_config = await self.get_config(session, key)
         
         if existing_config:
             # Update existing configuration
             config_data = ConfigUpdate(value=model_id)
-            return await self.update_config(session, "conversation_title_model_id", config_data)
+            return await self.update_config(session, key, config_data)
         else:
             # Create new configuration
             config_data = ConfigCreate(
-                key="conversation_title_model_id",
+                key=key,
                 value=model_id,
                 description="Model ID used for generating conversation titles",
                 is_public=False,
@@ -4,12 +4,17 @@ Admin User Management API
 from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi_pagination import Page, paginate
-from sqlalchemy import select, or_, func
+from fastapi_pagination import Page
+from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
+from sqlalchemy import select, update, delete, or_, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.database import get_async_session
+from src.auth.refresh_token_models import RefreshToken
+from src.channels.models import UserChannelBinding
+from src.channels.service import channel_binding_cache_key
+from src.services.cache import get_cache_service
 from src.users.models import User
 from .schemas import UserRead, UserUpdate, UserAdminUpdate
 
@@ -34,9 +39,12 @@ async def list_users(
     
     # Search conditions
     if search:
+        # Match on lower(...) so PostgreSQL can use the trigram indexes for
+        # terms of 3+ characters; shorter terms fall back to a scan
+        pattern = f'%{search.lower()}%'
         search_filter = or_(
-            User.email.ilike(f'%{search}%'),
-            User.name.ilike(f'%{search}%')
+            func.lower(User.email).like(pattern),
+            func.lower(User.name).like(pattern)
         )
         query = query.where(search_filter)
     
@@ -53,18 +61,8 @@ async def list_users(
     # Order by creation time descending
     query = query.order_by(User.created_at.desc())
     
-    # Execute query
-    result = await session.execute(query)
-    users = result.scalars().all()
-    
-    # Get user balance info - REMOVED: Billing system no longer exists
-    # Fill balance info - REMOVED: Billing system no longer exists
-    for user in users:
-        user.balance = 0
-        user.total_recharged = 0
-    
-    # Use fastapi-pagination for pagination
-    return paginate(users)
+    # Paginate in SQL (LIMIT/OFFSET plus a COUNT) instead of loading every user
+    return await sqlalchemy_paginate(session, query)
 
 
 @router.get('/{user_id}', response_model=UserRead)
@@ -95,6 +93,25 @@ async def update_user(
     
     Admin can update all fields of a user
     """
+    update_data = user_update.model_dump(exclude_unset=True)
+    
+    if update_data and session.get_bind().dialect.update_returning:
+        # Update and re-read the row in a single statement
+        result = await session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User),
+            execution_options={"populate_existing": True}
+        )
+        user = result.scalar_one_or_none()
+        
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        await session.commit()
+        return user
+    
     result = await session.execute(
         select(User).where(User.id == user_id)
     )
@@ -103,8 +120,10 @@ async def update_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    if not update_data:
+        return user
+    
     # Update user fields
-    update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user, field, value)
     
@@ -124,16 +143,32 @@ async def delete_user(
     
     Note: This is a hard delete operation
     """
+    # Delete the user's refresh tokens and channel bindings explicitly rather
+    # than relying on the foreign key cascade, which SQLite does not enforce
+    # by default
+    await session.execute(
+        delete(RefreshToken).where(RefreshToken.user_id == user_id)
+    )
+    bindings = (await session.execute(
+        select(UserChannelBinding.provider, UserChannelBinding.external_user_id)
+        .where(UserChannelBinding.user_id == user_id)
+    )).all()
+    await session.execute(
+        delete(UserChannelBinding).where(UserChannelBinding.user_id == user_id)
+    )
     result = await session.execute(
-        select(User).where(User.id == user_id)
+        delete(User).where(User.id == user_id)
     )
-    user = result.scalar_one_or_none()
     
-    if not user:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
-    await session.delete(user)
     await session.commit()
+    # Drop cached external -> internal id mappings so channel messages
+    # don't resolve to the deleted user
+    cache = get_cache_service()
+    for provider, external_user_id in bindings:
+        await cache.delete(channel_binding_cache_key(provider, external_user_id))
     
     return {"message": "User deleted successfully"}
 
@@ -145,27 +180,17 @@ async def get_user_stats(
     """
     Get user statistics
     """
-    # Total users
-    total_result = await session.execute(select(func.count(User.id)))
-    total_users = total_result.scalar()
-    
-    # Active users
-    active_result = await session.execute(
-        select(func.count(User.id)).where(User.is_active.is_(True))
-    )
-    active_users = active_result.scalar()
-    
-    # Verified users
-    verified_result = await session.execute(
-        select(func.count(User.id)).where(User.is_verified.is_(True))
-    )
-    verified_users = verified_result.scalar()
-    
-    # Admin users
-    admin_result = await session.execute(
-        select(func.count(User.id)).where(User.is_superuser.is_(True))
+    # One pass over users; COUNT(CASE ...) skips NULLs, which works on every
+    # supported database (MySQL has no FILTER clause)
+    result = await session.execute(
+        select(
+            func.count(User.id).label("total_users"),
+            func.count(case((User.is_active.is_(True), 1))).label("active_users"),
+            func.count(case((User.is_verified.is_(True), 1))).label("verified_users"),
+            func.count(case((User.is_superuser.is_(True), 1))).label("admin_users"),
+        )
     )
-    admin_users = admin_result.scalar()
+    total_users, active_users, verified_users, admin_users = result.one()
     
     return {
         "total_users": total_users,
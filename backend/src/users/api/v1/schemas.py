@@ -10,8 +10,9 @@ class UserRead(schemas.BaseUser[uuid.UUID]):
     name: Optional[str] = None
     avatar_url: Optional[str] = None
     created_at: Optional[datetime] = None
-    balance: Optional[Decimal] = None
-    total_recharged: Optional[Decimal] = None
+    # Billing system no longer exists; kept for API compatibility
+    balance: Decimal = Decimal(0)
+    total_recharged: Decimal = Decimal(0)
 
 
 class UserUpdate(schemas.CreateUpdateDictModel):
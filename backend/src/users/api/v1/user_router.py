@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+import hashlib
+
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth import fastapi_users, current_active_user
@@ -15,6 +17,7 @@ router = APIRouter(
 
 @router.get("/me", response_model=UserRead)
 async def get_current_user_profile(
+    request: Request,
     user: User = Depends(current_active_user),
 ):
     """
@@ -25,11 +28,22 @@ async def get_current_user_profile(
     user_data = UserRead.model_validate(user)
     
     if user_data.avatar_url and not user_data.avatar_url.startswith(('http://', 'https://')):
-        # Convert relative path to full URL
-        from src.files.storage import storage_service
-        user_data.avatar_url = await storage_service.get_public_url(user_data.avatar_url)
+        # Convert relative path to full URL; public URLs are unsigned, so the
+        # sync variant is a plain string join without a coroutine round trip
+        user_data.avatar_url = storage_service.get_public_url_sync(user_data.avatar_url)
+    
+    # The browser must revalidate every time (the URL is the same for every
+    # signed-in user), but an unchanged profile is answered with a bodyless 304
+    content = user_data.model_dump_json()
+    etag = f'"{hashlib.blake2b(content.encode(), digest_size=16).hexdigest()}"'
+    headers = {
+        "Cache-Control": "private, no-cache",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return user_data
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.put("/profile", response_model=UserRead)
@@ -46,7 +60,7 @@ async def update_user_profile(
         if profile_update.avatar_url and not profile_update.avatar_url.startswith(('http://', 'https://')):
              # Assuming frontend sends file path, we need to get full public URL
              # Note: Assuming avatar_url is a path stored on S3
-             full_url = await storage_service.get_public_url(profile_update.avatar_url)
+             full_url = storage_service.get_public_url_sync(profile_update.avatar_url)
              update_dict["avatar_url"] = full_url
         else:
              update_dict["avatar_url"] = profile_update.avatar_url
@@ -5,7 +5,7 @@ from fastapi_users_db_sqlalchemy import (
     SQLAlchemyBaseUserTableUUID,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime
+from sqlalchemy import DDL, DateTime, Index, String, event, func, text
 
 from src.models import Base
 
@@ -15,6 +15,16 @@ if TYPE_CHECKING:
 
 class User(Base, SQLAlchemyBaseUserTableUUID):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin user list filters on any of the flags and orders by creation time
+        Index("ix_users_admin_filters", "is_active", "is_verified", "is_superuser", "created_at"),
+        # Active users newest first, without visiting inactive rows
+        Index(
+            "ix_users_active_created_at",
+            "created_at",
+            postgresql_where=text("is_active"),
+        ).ddl_if(dialect="postgresql"),
+    )
     
     # Override base class email field, set to nullable
     email: Mapped[Optional[str]] = mapped_column(String(320), nullable=True, unique=True)
@@ -38,5 +48,28 @@ class User(Base, SQLAlchemyBaseUserTableUUID):
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
         "RefreshToken",
         back_populates="user",
-        cascade="all, delete-orphan"
-    )
\ No newline at end of file
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql"
+    )
+
+
+# Trigram indexes serve the admin substring search on email and name; they
+# need pg_trgm, so they are only created on PostgreSQL
+Index(
+    "ix_users_email_trgm",
+    func.lower(User.email).label("email_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"email_lower": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_users_name_trgm",
+    func.lower(User.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,15 +1,27 @@
 """
 Language detection utility functions
 """
+from functools import lru_cache
 from typing import Optional
 from fastapi import Request
 
 
-# Supported languages list
-SUPPORTED_LANGUAGES = ['en', 'zh']
+# Supported languages
+SUPPORTED_LANGUAGES = frozenset(('en', 'zh'))
 DEFAULT_LANGUAGE = 'en'
 
 
+@lru_cache(maxsize=512)
+def _primary_language(value: str) -> Optional[str]:
+    """
+    Primary language code of the first entry in a language tag or
+    Accept-Language value, or None if it isn't supported.
+    Clients send a handful of distinct values, so results are cached.
+    """
+    lang = value.split(',')[0].split('-')[0].split('_')[0].lower()
+    return lang if lang in SUPPORTED_LANGUAGES else None
+
+
 def detect_language(
     user_language: Optional[str] = None,
     request: Optional[Request] = None,
@@ -41,8 +53,8 @@ def detect_language(
         if accept_language:
             # Parse Accept-Language: 'zh-CN,zh;q=0.9,en;q=0.8'
             # Take the first language and keep only the primary language code
-            lang = accept_language.split(',')[0].split('-')[0].split('_')[0].lower()
-            if lang in SUPPORTED_LANGUAGES:
+            lang = _primary_language(accept_language)
+            if lang:
                 return lang
     
     # 3. Return default language
@@ -66,11 +78,5 @@ def normalize_language(lang: Optional[str]) -> str:
     if not lang:
         return DEFAULT_LANGUAGE
     
-    # Convert to lowercase and take primary language code
-    lang = lang.lower().split('-')[0].split('_')[0]
-    
-    # Check if supported
-    if lang in SUPPORTED_LANGUAGES:
-        return lang
-    
-    return DEFAULT_LANGUAGE
+    # Take the lowercase primary language code if it is supported
+    return _primary_language(lang) or DEFAULT_LANGUAGE
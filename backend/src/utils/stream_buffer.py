@@ -1,40 +1,97 @@
 import asyncio
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 import time
 
+# Streams kept at most; the least recently used one is dropped beyond this
+MAX_STREAMS = 10_000
+# Finished streams are dropped this many seconds after they were created
+STREAM_TTL = 3600
+CLEANUP_INTERVAL = 60
+
 class StreamBuffer:
     _instance = None
-    _store: Dict[str, Dict[str, Any]] = {}
+    _store: "OrderedDict[str, Dict[str, Any]]"
+    _cleanup_task: Optional[asyncio.Task]
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(StreamBuffer, cls).__new__(cls)
+            # Per instance rather than a class attribute, so replacing the
+            # singleton (e.g. in tests) starts from an empty store
+            cls._instance._store = OrderedDict()
+            cls._instance._cleanup_task = None
         return cls._instance
 
+    # The methods below stay async for their callers but never await, so
+    # each runs to completion without interleaving with other coroutines
+
     async def init_stream(self, stream_id: str):
+        # Content is kept as a list of chunks so appends don't copy the text
+        # streamed so far; get_state joins them
         self._store[stream_id] = {
-            "content": "",
+            "chunks": [],
             "finished": False,
-            "created_at": time.time()
+            "created_at": time.monotonic()
         }
+        self._store.move_to_end(stream_id)
+        while len(self._store) > MAX_STREAMS:
+            self._store.popitem(last=False)
+        self._ensure_cleanup_task()
 
     async def append_content(self, stream_id: str, content: str):
-        if stream_id in self._store:
-            self._store[stream_id]["content"] += content
+        state = self._store.get(stream_id)
+        if state is not None:
+            state["chunks"].append(content)
+            self._store.move_to_end(stream_id)
 
     async def set_content(self, stream_id: str, content: str):
-        if stream_id in self._store:
-            self._store[stream_id]["content"] = content
+        state = self._store.get(stream_id)
+        if state is not None:
+            state["chunks"] = [content]
 
     async def mark_finished(self, stream_id: str):
-        if stream_id in self._store:
-            self._store[stream_id]["finished"] = True
+        state = self._store.get(stream_id)
+        if state is not None:
+            state["finished"] = True
 
     async def get_state(self, stream_id: str) -> Optional[Dict[str, Any]]:
-        return self._store.get(stream_id)
+        state = self._store.get(stream_id)
+        if state is None:
+            return None
+        self._store.move_to_end(stream_id)
+
+        chunks = state["chunks"]
+        if len(chunks) > 1:
+            # Keep the joined text so the next poll only joins newer chunks
+            chunks[:] = ["".join(chunks)]
+        return {
+            "content": chunks[0] if chunks else "",
+            "finished": state["finished"],
+            "created_at": state["created_at"],
+        }
+
+    async def cleanup(self, ttl: int = STREAM_TTL):
+        """Drop finished streams created more than ttl seconds ago"""
+        cutoff = time.monotonic() - ttl
+        expired = [
+            stream_id for stream_id, state in self._store.items()
+            if state["finished"] and state["created_at"] <= cutoff
+        ]
+        for stream_id in expired:
+            del self._store[stream_id]
+
+    def _ensure_cleanup_task(self):
+        # Started lazily from the first stream, since the singleton is created
+        # at import time without a running loop; restarted if that loop is gone
+        task = self._cleanup_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._cleanup_task = loop.create_task(self._periodic_cleanup())
 
-    async def cleanup(self, ttl: int = 3600):
-        # Todo: Implement cleanup logic
-        pass
+    async def _periodic_cleanup(self):
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL)
+            await self.cleanup()
 
 stream_buffer = StreamBuffer()
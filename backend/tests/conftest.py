@@ -1,9 +1,10 @@
 import pytest
-import asyncio
 import pytest_asyncio
 from typing import AsyncGenerator
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncConnection, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 
 from src.main import app
 from src.models import Base
@@ -19,60 +20,88 @@ import src.scheduler.models
 from src.database import get_async_session
 
 
-# TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./testing.db"
-
-
-@pytest_asyncio.fixture(scope="session")
-def event_loop():
-    """Create a session-level event loop"""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+# In-memory database; StaticPool keeps the single connection that holds it
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
 @pytest_asyncio.fixture(scope="session")
 async def test_engine():
-    """Create test database engine"""
+    """Create test database engine and tables once for the whole run"""
     engine = create_async_engine(
         TEST_DATABASE_URL,
         echo=False,  # Set to True to view SQL statements
-        future=True,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
     )
+
+    # pysqlite defers BEGIN and ignores SAVEPOINT bookkeeping unless its own
+    # transaction handling is turned off; without this a test's commit would
+    # not be rolled back afterwards
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
 @pytest_asyncio.fixture(scope="session")
 async def setup_database(test_engine):
-    """Create database tables"""
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Database tables (created together with test_engine)"""
     yield
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
 
 
-@pytest_asyncio.fixture
-async def async_session_maker(test_engine):
-    """Create async session maker"""
+@pytest_asyncio.fixture(scope="session")
+async def connection(test_engine) -> AsyncGenerator[AsyncConnection, None]:
+    """Single connection shared by all tests"""
+    async with test_engine.connect() as connection:
+        yield connection
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_session_maker(connection):
+    """Create async session maker bound to the shared connection"""
     return async_sessionmaker(
-        test_engine,
+        connection,
         class_=AsyncSession,
+        join_transaction_mode="create_savepoint",
         expire_on_commit=False,
     )
 
 
 @pytest_asyncio.fixture
-async def session(async_session_maker) -> AsyncGenerator[AsyncSession, None]:
-    """Provide a clean database session for testing"""
+async def session(connection, async_session_maker) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a clean database session for testing
+
+    Everything a test writes, including commits (which only release a
+    SAVEPOINT), is rolled back with the outer transaction afterwards.
+    """
+    transaction = await connection.begin()
     async with async_session_maker() as session:
         yield session
-        await session.rollback()
+    await transaction.rollback()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """One ASGI client reused by every test (the app lifespan is not run)"""
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://testserver"
+    ) as client:
+        yield client
 
 
 @pytest_asyncio.fixture
-async def client(session) -> AsyncGenerator[AsyncClient, None]:
+async def client(http_client, session) -> AsyncGenerator[AsyncClient, None]:
     """Create test client and override database dependency"""
     
     async def override_get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -81,11 +110,7 @@ async def client(session) -> AsyncGenerator[AsyncClient, None]:
     # Override database dependency
     app.dependency_overrides[get_async_session] = override_get_async_session
     
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://testserver"
-    ) as client:
-        yield client
+    yield http_client
     
     # Clean up dependency overrides
     app.dependency_overrides.clear()
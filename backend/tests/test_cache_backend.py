@@ -0,0 +1,67 @@
+"""Tests for shared CacheBackend behaviour and the tiered cache"""
+import asyncio
+
+import pytest
+
+from src.services.cache.drivers.memory import MemoryDriver
+from src.services.cache.drivers.tiered import TieredCache
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_runs_loader_once_for_concurrent_misses():
+    cache = MemoryDriver()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_set("k", loader) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert await cache.get("k") == "value"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_propagates_loader_errors_to_all_waiters():
+    cache = MemoryDriver()
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(cache.get_or_set("k", loader) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await cache.get("k") is None
+    # The failed fill is not remembered
+    assert await cache.get_or_set("k", lambda: asyncio.sleep(0, "ok")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_tiered_delete_invalidates_l1():
+    l1, l2 = MemoryDriver(), MemoryDriver()
+    cache = TieredCache(l1, l2)
+    await cache.set("k", "v")
+    assert await l1.get("k") == "v"
+
+    await cache.delete("k")
+
+    assert await l1.get("k") is None
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_tiered_get_fills_l1_from_l2():
+    l1, l2 = MemoryDriver(), MemoryDriver()
+    cache = TieredCache(l1, l2)
+    await l2.set("k", "v")
+
+    assert await cache.get("k") == "v"
+    assert await l1.get("k") == "v"
@@ -0,0 +1,39 @@
+"""Tests for merging small channel stream chunks"""
+import asyncio
+
+import pytest
+
+from src.channels.services.base import coalesce_stream
+
+
+async def _chunks(*items, delay: float = 0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_merges_fast_chunks_into_one():
+    merged = await _collect(coalesce_stream(_chunks("a", "b", "", "c"), max_delay=10))
+
+    assert merged == ["abc"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_at_max_chars():
+    merged = await _collect(coalesce_stream(_chunks("ab", "cd", "ef", "g"), max_delay=10, max_chars=4))
+
+    assert merged == ["abcd", "efg"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_max_delay():
+    merged = await _collect(coalesce_stream(_chunks("a", "b", delay=0.05), max_delay=0.01))
+
+    assert merged == ["a", "b"]
+
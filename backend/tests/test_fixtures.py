@@ -1,36 +1,60 @@
 """Test if fixtures configuration works correctly"""
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import inspect, select, text
+
+from src.users.models import User
+
+
+SELECT_ONE = text("SELECT 1 as test")
+
+ISOLATION_EMAIL = "isolation@example.com"
+
+
+@pytest_asyncio.fixture(scope="session")
+async def table_names(test_engine) -> list[str]:
+    """Tables in the test schema, reflected once since they don't change between tests"""
+    async with test_engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
 
 
 class TestFixtures:
     """Test basic functionality of async fixtures"""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(loop_scope="session")
+
     async def test_async_session(self, session: AsyncSession):
-        """Test if async database session works properly"""
+        """Test async database session"""
         assert session is not None
-        # Execute a simple query to verify the connection
-        result = await session.execute(text("SELECT 1 as test"))
-        row = result.fetchone()
-        assert row.test == 1
 
-    @pytest.mark.asyncio
+        # Execute simple query to verify connection
+        result = await session.execute(SELECT_ONE)
+        assert result.scalar_one() == 1
+
     async def test_async_client(self, client: AsyncClient):
-        """Test if async client works properly"""
+        """Test async HTTP client"""
         assert client is not None
-        # Test basic HTTP request
+
+        # Should return 404 due to the absence of the root path,
+        # but this proves the client works correctly
         response = await client.get("/")
-        # Should return 404 due to the absence of the root path, but this proves the client works correctly
         assert response.status_code in [200, 404]
 
-    @pytest.mark.asyncio
+    async def test_schema_created(self, table_names: list[str]):
+        """Test that the tables from the model definitions exist"""
+        assert User.__tablename__ in table_names
+
+    async def test_commit_is_rolled_back_after_test(self, session: AsyncSession):
+        """Commit a row; the next test checks that it did not survive"""
+        session.add(User(email=ISOLATION_EMAIL, hashed_password="x"))
+        await session.commit()
+
+        result = await session.execute(select(User).where(User.email == ISOLATION_EMAIL))
+        assert result.scalar_one_or_none() is not None
+
     async def test_database_isolation(self, session: AsyncSession):
-        """Test database isolation - each test has an independent session"""
-        # This test verifies that each test function gets a clean database state
-        result = await session.execute(text("SELECT COUNT(*) as count FROM sqlite_master WHERE type='table'"))
-        row = result.fetchone()
-        # There should be some tables (from model definitions)
-        assert row.count >= 0
+        """Test that the row committed by the previous test is not visible"""
+        result = await session.execute(select(User).where(User.email == ISOLATION_EMAIL))
+        assert result.scalar_one_or_none() is None
@@ -0,0 +1,51 @@
+"""Tests for the in-process memory cache driver"""
+import pytest
+
+from src.services.cache.drivers.memory import MemoryDriver
+
+
+@pytest.mark.asyncio
+async def test_exists_evicts_expired_prefixed_key():
+    cache = MemoryDriver(prefix="test:")
+    await cache.set("k", 1, expire=0)
+    # Expiry is strict, so step past it without sleeping
+    cache._store["test:k"][1] -= 1
+
+    assert await cache.exists("k") is False
+    assert cache._store == {}
+
+
+@pytest.mark.asyncio
+async def test_exists_keeps_live_prefixed_key():
+    cache = MemoryDriver(prefix="test:")
+    await cache.set("k", 1)
+
+    assert await cache.exists("k") is True
+    assert await cache.get("k") == 1
+
+
+@pytest.mark.asyncio
+async def test_new_key_survives_next_eviction():
+    cache = MemoryDriver(max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.set("c", 3)
+    await cache.set("d", 4)
+
+    assert await cache.get("d") == 4
+    assert len(cache._store) == 2
+
+
+@pytest.mark.asyncio
+async def test_eviction_prefers_expired_keys():
+    cache = MemoryDriver(max_entries=2)
+    await cache.set("hot", 1)
+    for _ in range(10):
+        await cache.get("hot")
+    await cache.set("stale", 2, expire=0)
+    cache._store["stale"][1] -= 1
+    await cache.set("hot2", 3)
+    await cache.set("new", 4)
+
+    assert "stale" not in cache._store
+    assert await cache.get("new") == 4
@@ -0,0 +1,35 @@
+"""Tests for the RAG search result cache"""
+import uuid
+
+from src.rag.query_cache import QueryResultCache
+
+
+def test_serves_repeats_of_the_same_normalized_query():
+    cache = QueryResultCache()
+    scope = ("model", (uuid.uuid4(),), 5)
+    cache.put(scope, "Enable  Dark mode", "results")
+
+    assert cache.get(scope, "enable dark mode ") == "results"
+
+
+def test_paraphrases_and_other_scopes_miss():
+    cache = QueryResultCache()
+    kb_id = uuid.uuid4()
+    cache.put(("model", (kb_id,), 5), "enable dark mode", "results")
+
+    assert cache.get(("model", (kb_id,), 5), "disable dark mode") is None
+    assert cache.get(("model", (kb_id,), 10), "enable dark mode") is None
+
+
+def test_invalidate_drops_every_scope_with_the_knowledge_base():
+    cache = QueryResultCache()
+    kb_id, other_id = uuid.uuid4(), uuid.uuid4()
+    cache.put(("model", (kb_id,), 5), "q", "a")
+    cache.put(("model", (kb_id, other_id), 5), "q", "b")
+    cache.put(("model", (other_id,), 5), "q", "c")
+
+    cache.invalidate(kb_id)
+
+    assert cache.get(("model", (kb_id,), 5), "q") is None
+    assert cache.get(("model", (kb_id, other_id), 5), "q") is None
+    assert cache.get(("model", (other_id,), 5), "q") == "c"
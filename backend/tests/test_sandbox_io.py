@@ -0,0 +1,142 @@
+"""Tests for the sandbox tar, exec output and file read helpers"""
+import asyncio
+import io
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+from aiodocker.exceptions import DockerError
+
+from src.config import settings
+from src.sandbox.service import SandboxService, build_single_file_tar, read_exec_output
+
+
+def _read_single(archive: bytes) -> tuple[str, bytes]:
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        member, = tar.getmembers()
+        return member.name, tar.extractfile(member).read()
+
+
+@pytest.mark.parametrize("name, data", [
+    ("script.py", b"print('hi')\n"),
+    ("empty.txt", b""),
+    ("block.bin", bytes(range(256)) * 2),
+    ("d" * 100, b"exactly the USTAR name limit"),
+    ("nested/" + "long" * 40 + ".txt", b"needs a long-name header"),
+])
+def test_build_single_file_tar_round_trips(name, data):
+    archive = build_single_file_tar(name.encode("utf-8"), data)
+
+    assert len(archive) % 512 == 0
+    assert _read_single(archive) == (name, data)
+
+
+@pytest.mark.asyncio
+async def test_read_exec_output_splits_streams():
+    messages = iter([
+        SimpleNamespace(stream=1, data=b"out "),
+        SimpleNamespace(stream=2, data=b"err"),
+        SimpleNamespace(stream=1, data=b"more"),
+    ])
+
+    async def read_out():
+        return next(messages, None)
+
+    stdout, stderr = await read_exec_output(SimpleNamespace(read_out=read_out))
+
+    assert stdout == b"out more"
+    assert stderr == b"err"
+
+
+class _ArchiveContainer:
+    def __init__(self, archive: bytes, error: Exception = None, delay: float = 0):
+        self._archive = archive
+        self._error = error
+        self._delay = delay
+        self.paths = []
+
+    async def get_archive(self, path: str) -> tarfile.TarFile:
+        self.paths.append(path)
+        await asyncio.sleep(self._delay)
+        if self._error is not None:
+            raise self._error
+        return tarfile.open(fileobj=io.BytesIO(self._archive))
+
+    async def show(self):
+        return {"State": {"Running": True}, "HostConfig": {}}
+
+
+def _service_with(container: _ArchiveContainer, fresh: _ArchiveContainer = None) -> SandboxService:
+    """Service whose cached container for conversation c1 is `container`;
+    looking the container up again by name yields `fresh`"""
+    async def get(name):
+        return fresh
+
+    service = SandboxService()
+    service._docker = SimpleNamespace(containers=SimpleNamespace(get=get))
+    service._containers["c1"] = container
+    return service
+
+
+@pytest.mark.asyncio
+async def test_read_archive_file_returns_member_content():
+    archive = build_single_file_tar(b"report.csv", b"a,b\n1,2\n")
+
+    content = await SandboxService()._read_archive_file(_ArchiveContainer(archive), "/home/sandbox/report.csv")
+
+    assert content == b"a,b\n1,2\n"
+
+
+@pytest.mark.asyncio
+async def test_read_archive_file_ignores_directories():
+    tar_stream = io.BytesIO()
+    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        info = tarfile.TarInfo("out")
+        info.type = tarfile.DIRTYPE
+        tar.addfile(info)
+
+    content = await SandboxService()._read_archive_file(_ArchiveContainer(tar_stream.getvalue()), "/home/sandbox/out")
+
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_read_file_bytes_reads_from_cached_container():
+    container = _ArchiveContainer(build_single_file_tar(b"data.csv", b"1,2\n"))
+
+    content = await _service_with(container).read_file_bytes("c1", "data.csv")
+
+    assert content == b"1,2\n"
+    assert container.paths == [f"{settings.SANDBOX_WORK_DIR}/data.csv"]
+
+
+@pytest.mark.asyncio
+async def test_read_file_bytes_retries_on_a_fresh_container():
+    stale = _ArchiveContainer(b"", error=DockerError(404, {"message": "No such container"}))
+    fresh = _ArchiveContainer(build_single_file_tar(b"data.csv", b"1,2\n"))
+    service = _service_with(stale, fresh)
+
+    assert await service.read_file_bytes("c1", "data.csv") == b"1,2\n"
+    assert service._containers["c1"] is fresh
+
+
+@pytest.mark.asyncio
+async def test_read_file_bytes_gives_up_after_api_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "SANDBOX_API_TIMEOUT", 0.01)
+    container = _ArchiveContainer(build_single_file_tar(b"data.csv", b"1,2\n"), delay=1)
+    service = _service_with(container)
+
+    assert await service.read_file_bytes("c1", "data.csv") is None
+    assert len(service._timeouts) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_file_bytes_reads_the_io_dir_directly(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SANDBOX_HOST_IO_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SANDBOX_LOCAL_IO_DIR", None)
+    (tmp_path / "c1").mkdir()
+    (tmp_path / "c1" / "data.csv").write_bytes(b"1,2\n")
+    container = _ArchiveContainer(b"")
+
+    assert await _service_with(container).read_file_bytes("c1", "data.csv") == b"1,2\n"
+    assert container.paths == []
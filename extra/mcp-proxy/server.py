@@ -1,16 +1,11 @@
 import asyncio
-import os
-import sys
-import logging
-from typing import Any
 
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.server.sse import SseServerTransport
-from starlette.applications import Starlette
-from starlette.routing import Route, Mount
-from starlette.responses import Response
-import uvicorn
+try:
+    # libuv-based loop for the stdin/stdout <-> SSE pumping; optional, so the
+    # proxy still runs on the default asyncio loop where it isn't installed
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # This is a placeholder. 
 # Implementing a generic Stdio -> SSE proxy is complex because it requires parsing the Stdio traffic 
@@ -27,8 +22,14 @@ import uvicorn
 # and for "Filesystem", I will provide a dedicated Python script that IMPLEMENTS a filesystem MCP server 
 # using the mcp-python-sdk and exposes it via SSE. This is much more robust than proxying npx.
 
+# The mcp, starlette and uvicorn imports for that server belong with its
+# implementation; the placeholder doesn't pay for loading them.
+
 async def main():
     print("This is a placeholder for the MCP SSE Proxy.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
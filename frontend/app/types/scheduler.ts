@@ -33,8 +33,10 @@ export interface ScheduledTaskExecution {
   status: 'PENDING' | 'RUNNING' | 'COMPLETED' | 'FAILED'
   started_at: string
   completed_at?: string
-  duration?: string
+  duration?: number
   result_summary?: string
+  result_length?: number
+  result_hash?: string
   error_message?: string
 }
 